@@ -13,6 +13,7 @@ echo "📦 Building Frontend..."
 cd web
 rm -rf .next
 pnpm install
+python3 data/build_data.py || exit 1
 pnpm build
 cd ..
 
@@ -24,6 +25,7 @@ tar -czf $DEPLOY_ARCHIVE \
     web/package.json \
     web/pnpm-lock.yaml \
     web/next.config.ts \
+    web/data/tarot-bundle.json \
     backend/main.py \
     backend/requirements.txt \
     backend/app \
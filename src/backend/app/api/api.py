@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import tarot
+from app.api.endpoints import debug, tarot
 
 api_router = APIRouter()
 api_router.include_router(tarot.router, prefix="/tarot", tags=["tarot"])
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiler import MAX_PROFILE_SECONDS, ProfilerBusyError, run_profile
+from app.core.security import is_valid_debug_token
+from app.core.tracing import render_timeline, tracer
+
+router = APIRouter()
+
+
+def require_debug_token(x_debug_token: str = Header(default="")) -> None:
+    # Without a configured token the debug routes behave as if they did not exist.
+    if not settings.DEBUG_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_valid_debug_token(x_debug_token):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+@router.get("/traces/{request_id}", dependencies=[Depends(require_debug_token)])
+def get_trace(request_id: str, format: str = "text"):
+    spans = tracer.get_trace(request_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    if format == "json":
+        return {"requestId": request_id, "spans": [s.to_dict() for s in spans]}
+    return PlainTextResponse(render_timeline(spans))
+
+
+@router.post("/profile", dependencies=[Depends(require_debug_token)])
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    block_ms: float = Query(50, ge=1),
+):
+    """Sample the worker that serves this request; responds once the window has elapsed."""
+    try:
+        return await run_profile(seconds, interval_ms=interval_ms, block_threshold_ms=block_ms)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
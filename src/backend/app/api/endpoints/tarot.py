@@ -1,11 +1,27 @@
+import time
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.core.logger import logger
+from app.core.tracing import tracer
 from app.schemas.tarot import TarotChatRequest, TarotRequest
-from app.services.llm_stream_service import SSE_HEADERS, stream_chat_completion
+from app.services.card_search_service import get_card_search_index
+from app.services.chat_session_service import (
+    ChatSessionFullError,
+    chat_session_store,
+    new_session_id,
+)
+from app.services.fallback_reading_service import stream_fallback_reading
+from app.services.llm_stream_service import (
+    SSE_HEADERS,
+    parse_sse_content,
+    stream_chat_completion,
+)
+from app.services.load_shedder import llm_load_shedder
 from app.services.settings_service import SettingsService
 
 router = APIRouter()
@@ -21,14 +37,72 @@ def _get_llm_config() -> tuple[str, str, str]:
     return api_key, base_url, model
 
 
-def _build_streaming_response(stream_factory):
+def _build_streaming_response(
+    stream_factory,
+    reading_mode: str = "llm",
+    session_id: Optional[str] = None,
+    background: Optional[BackgroundTask] = None,
+):
+    headers = {**SSE_HEADERS, "X-Reading-Mode": reading_mode}
+    if session_id:
+        headers["X-Chat-Session-ID"] = session_id
     return StreamingResponse(
         stream_factory(),
         media_type="text/event-stream",
-        headers=SSE_HEADERS,
+        headers=headers,
+        background=background,
     )
 
 
+def _claim_llm_slot() -> BackgroundTask:
+    """Count the LLM stream as in flight from the moment the handler commits to it; the
+    returned task releases the slot once the response has finished (or been abandoned)."""
+    llm_load_shedder.begin()
+    return BackgroundTask(llm_load_shedder.end)
+
+
+async def _tracked_llm_stream(**kwargs):
+    """Proxy stream_chat_completion while feeding first-chunk latency and upstream errors
+    to the load shedder (the inflight count is claimed by the handler)."""
+    started = time.perf_counter()
+    first_chunk = True
+    async for chunk in stream_chat_completion(**kwargs):
+        if first_chunk:
+            # A fast 429/5xx error frame is not a latency sample; it would mask overload.
+            if parse_sse_content(chunk)[1]:
+                llm_load_shedder.record_error()
+            else:
+                llm_load_shedder.record_latency((time.perf_counter() - started) * 1000)
+            first_chunk = False
+        yield chunk
+
+
+async def _record_into_session(stream, session_id: str, new_messages: list[dict[str, str]]):
+    """Pass frames through; once the stream ends without an error frame, append
+    new_messages plus the assembled assistant reply to the chat session."""
+    parts: list[str] = []
+    failed = False
+    async for chunk in stream:
+        content, is_error = parse_sse_content(chunk)
+        failed = failed or is_error
+        if content:
+            parts.append(content)
+        yield chunk
+
+    if failed or not parts:
+        return
+    try:
+        await chat_session_store.append(
+            session_id, new_messages + [{"role": "assistant", "content": "".join(parts)}]
+        )
+    except Exception as e:
+        logger.warning(f"Chat session {session_id} was not saved: {e}")
+
+
+def _date_system_message() -> dict[str, str]:
+    return {"role": "system", "content": f"当前日期：{datetime.now().strftime('%Y年%m月%d日')}。"}
+
+
 def _build_analysis_prompts(req: TarotRequest) -> tuple[str, str]:
     current_date = datetime.now().strftime("%Y年%m月%d日")
     cards_str = ""
@@ -50,9 +124,14 @@ def _build_analysis_prompts(req: TarotRequest) -> tuple[str, str]:
 
 @router.post("/analyze")
 async def analyze_tarot(req: TarotRequest, request: Request):
-    api_key, base_url, model = _get_llm_config()
     request_id = getattr(request.state, "request_id", "-")
+    tracer.record_since_request_start("request.validate", cards=len(req.drawnCards))
+    session_id = new_session_id()
+    if req.readingMode == "offline":
+        return _build_fallback_response(req, request_id, session_id)
 
+    with tracer.start_span("llm.config"):
+        api_key, base_url, model = _get_llm_config()
     logger.info(f"[rid:{request_id}] Tarot Analysis Request - Model: {model}, Base URL: {base_url}")
     if api_key:
         logger.info(f"API Key used: {api_key[:5]}...{api_key[-5:]}")
@@ -62,42 +141,111 @@ async def analyze_tarot(req: TarotRequest, request: Request):
     if not api_key:
         raise HTTPException(status_code=500, detail="LLM API Key not configured")
 
-    system_prompt, user_prompt = _build_analysis_prompts(req)
+    shed_reason = llm_load_shedder.shed_reason()
+    if shed_reason:
+        logger.warning(f"[rid:{request_id}] LLM load shedding active ({shed_reason})")
+        return _build_fallback_response(req, request_id, session_id, reason=shed_reason)
+
+    with tracer.start_span("prompt.build"):
+        system_prompt, user_prompt = _build_analysis_prompts(req)
+    prompt_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
 
     async def stream_response():
-        async for chunk in stream_chat_completion(
-            api_key=api_key,
-            base_url=base_url,
-            model=model,
-            request_id=request_id,
-            messages=[
+        async for chunk in _record_into_session(
+            _tracked_llm_stream(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                request_id=request_id,
+                messages=prompt_messages,
+            ),
+            session_id,
+            prompt_messages,
+        ):
+            yield chunk
+
+    return _build_streaming_response(
+        stream_response, session_id=session_id, background=_claim_llm_slot()
+    )
+
+
+def _build_fallback_response(
+    req: TarotRequest, request_id: str, session_id: str, reason: str = "requested"
+):
+    # The prompts are still registered so follow-up chat has the same context an LLM
+    # reading would have had.
+    system_prompt, user_prompt = _build_analysis_prompts(req)
+
+    def stream_factory():
+        return _record_into_session(
+            stream_fallback_reading(req, request_id, reason=reason),
+            session_id,
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-        ):
-            yield chunk
+        )
 
-    return _build_streaming_response(stream_response)
+    return _build_streaming_response(stream_factory, reading_mode="offline", session_id=session_id)
 
 
 @router.post("/chat")
 async def chat_tarot(req: TarotChatRequest, request: Request):
-    api_key, base_url, model = _get_llm_config()
     request_id = getattr(request.state, "request_id", "-")
+    tracer.record_since_request_start("request.validate", messages=len(req.messages or []))
+    with tracer.start_span("llm.config"):
+        api_key, base_url, model = _get_llm_config()
     if not api_key:
         raise HTTPException(status_code=500, detail="LLM API Key not configured")
 
+    if req.sessionId:
+        with tracer.start_span("session.load"):
+            try:
+                history = await chat_session_store.load(req.sessionId)
+            except Exception as e:
+                logger.error(f"[rid:{request_id}] Chat session store unavailable: {e}")
+                raise HTTPException(status_code=503, detail="Chat session store unavailable") from e
+        if history is None:
+            raise HTTPException(status_code=404, detail="Chat session not found or expired")
+        new_message = {"role": "user", "content": req.message}
+        try:
+            chat_session_store.ensure_capacity(history, incoming=2)
+        except ChatSessionFullError as e:
+            raise HTTPException(status_code=409, detail=str(e)) from e
+        conversation = history + [new_message]
+    else:
+        conversation = [{"role": m.role, "content": m.content} for m in req.messages]
+
     async def stream_response():
-        async for chunk in stream_chat_completion(
+        stream = _tracked_llm_stream(
             api_key=api_key,
             base_url=base_url,
             model=model,
             request_id=request_id,
-            messages=[
-                {"role": "system", "content": f"当前日期：{datetime.now().strftime('%Y年%m月%d日')}。"}
-            ]
-            + [{"role": m.role, "content": m.content} for m in req.messages],
-        ):
+            messages=[_date_system_message()] + conversation,
+        )
+        if req.sessionId:
+            stream = _record_into_session(stream, req.sessionId, [new_message])
+        async for chunk in stream:
             yield chunk
 
-    return _build_streaming_response(stream_response)
+    return _build_streaming_response(
+        stream_response, session_id=req.sessionId, background=_claim_llm_slot()
+    )
+
+
+@router.get("/cards/search")
+def search_cards(
+    q: str = Query("", max_length=100),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=78),
+):
+    return get_card_search_index().search(q, page=page, size=size)
+
+
+@router.get("/cards/suggest")
+def suggest_cards(q: str = Query("", max_length=50), limit: int = Query(8, ge=1, le=20)):
+    return {"query": q, "suggestions": get_card_search_index().suggest(q, limit=limit)}
@@ -18,6 +18,41 @@ class Settings(BaseSettings):
     LLM_BASE_URL: str = "https://api.siliconflow.cn/v1"
     TAROT_MODEL: str = "Qwen/Qwen3-Next-80B-A3B-Instruct"
 
+    # Server-held chat sessions (Redis list per reading)
+    CHAT_SESSION_TTL_SECONDS: int = 7200
+    CHAT_SESSION_MAX_MESSAGES: int = 50
+
+    # Tarot data (cards, meanings, spreads); empty means ../web/data
+    TAROT_DATA_DIR: str = ""
+
+    # Load shedding: switch readings to the offline fallback when the LLM is saturated.
+    # 0 disables the corresponding check.
+    LLM_SHED_MAX_INFLIGHT: int = 50
+    LLM_SHED_LATENCY_MS: int = 20000
+    LLM_SHED_WINDOW_SECONDS: int = 30
+    # Share of windowed LLM calls whose first frame was an upstream error, once at least
+    # LLM_SHED_MIN_ERROR_SAMPLES calls are in the window
+    LLM_SHED_ERROR_RATE: float = 0.5
+    LLM_SHED_MIN_ERROR_SAMPLES: int = 5
+
+    # Tracing: fraction of requests traced (0 disables; "X-Trace-Sample: 1" with a valid
+    # X-Debug-Token forces one)
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_BUFFER_SIZE: int = 200
+    TRACE_EXPORTER: str = ""  # "" (ring buffer only) or "file"
+    TRACE_EXPORT_PATH: str = ""  # defaults to logs/traces.jsonl
+
+    # Debug/admin endpoints are disabled unless a token is configured
+    DEBUG_API_TOKEN: str = ""
+
+    # Sampling profiler: output directory (defaults to logs/profiles) and the
+    # duration of a SIGUSR2-triggered session (0 disables the signal handler)
+    PROFILE_OUTPUT_DIR: str = ""
+    PROFILER_SIGNAL_SECONDS: int = 0
+
+    # Cold-start budget for `import main`, checked by tests and scripts/import_profile.py
+    STARTUP_IMPORT_BUDGET_MS: int = 1500
+
     model_config = SettingsConfigDict(
         case_sensitive=True,
         env_file=".env",
@@ -3,19 +3,29 @@ import os
 from logging.handlers import RotatingFileHandler
 
 # --- Configuration ---
-LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
-
+# LOG_DIR in the environment overrides the default backend/logs (the test suite points it
+# at a temp dir so runs do not write to the repo).
+LOG_DIR = os.environ.get("LOG_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs"
+)
 LOG_FILE = os.path.join(LOG_DIR, "system.log")
 
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """Creates the log directory and opens the file on the first record, not at import."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
 # --- Setup Standard Logger ---
 logger = logging.getLogger("EasyDynasty")
 logger.setLevel(logging.INFO)
 
 # File Handler (10MB per file, keep 5 backups)
-file_handler = RotatingFileHandler(
-    LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+file_handler = _LazyRotatingFileHandler(
+    LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8", delay=True
 )
 file_formatter = logging.Formatter("%(asctime)s [%(levelname)s] [%(module)s] %(message)s")
 file_handler.setFormatter(file_formatter)
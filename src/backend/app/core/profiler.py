@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.logger import LOG_DIR, logger
+
+MAX_PROFILE_SECONDS = 120
+LAG_PROBE_INTERVAL = 0.01
+IDLE_FRAME_FILES = ("selectors.py",)
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    # co_firstlineno keeps one node per function in the flamegraph regardless of the
+    # line currently executing; ';' and ' ' are separators in the collapsed format.
+    label = f"{code.co_name}({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":").replace(" ", "_")
+
+
+def collapse_stack(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _is_idle(frame) -> bool:
+    return os.path.basename(frame.f_code.co_filename) in IDLE_FRAME_FILES
+
+
+class ProfileSession:
+    """
+    对当前事件循环线程做统计采样。
+
+    采样线程按固定间隔读取 sys._current_frames()，同时事件循环内的探测任务
+    定期刷新心跳；心跳超过 block_threshold_ms 未更新时，说明有同步代码占住了
+    事件循环，此时采到的栈会单独记为阻塞栈。
+    """
+
+    def __init__(self, seconds: float, interval_ms: float, block_threshold_ms: float):
+        self.seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+        self.interval = max(interval_ms, 1) / 1000
+        self.block_threshold = block_threshold_ms / 1000
+        self.cpu_stacks: Counter[str] = Counter()
+        self.blocking_stacks: Counter[str] = Counter()
+        self.blocking_events: list[dict[str, Any]] = []
+        self.lags: list[float] = []
+        self.samples = 0
+        self.idle_samples = 0
+        self._heartbeat = time.perf_counter()
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._current_block: Optional[dict[str, Any]] = None
+
+    async def run(self) -> dict[str, Any]:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+        started_at = time.time()
+        sampler.start()
+        try:
+            deadline = time.perf_counter() + self.seconds
+            while time.perf_counter() < deadline:
+                expected = time.perf_counter() + LAG_PROBE_INTERVAL
+                await asyncio.sleep(LAG_PROBE_INTERVAL)
+                now = time.perf_counter()
+                self.lags.append(max(0.0, now - expected))
+                self._heartbeat = now
+        finally:
+            self._stop.set()
+            await asyncio.to_thread(sampler.join)
+        # Report files are written off the loop that was just profiled.
+        return await asyncio.to_thread(self._write_report, started_at)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            if _is_idle(frame):
+                self.idle_samples += 1
+                self._close_block()
+                continue
+            stack = collapse_stack(frame)
+            self.cpu_stacks[stack] += 1
+
+            blocked_for = time.perf_counter() - self._heartbeat
+            if blocked_for >= self.block_threshold:
+                self.blocking_stacks[stack] += 1
+                if self._current_block is None:
+                    self._current_block = {"stacks": Counter(), "durationMs": 0.0}
+                self._current_block["stacks"][stack] += 1
+                self._current_block["durationMs"] = round(blocked_for * 1000, 1)
+            else:
+                self._close_block()
+
+    def _close_block(self) -> None:
+        if self._current_block is None:
+            return
+        stack, _ = self._current_block["stacks"].most_common(1)[0]
+        self.blocking_events.append(
+            {"durationMs": self._current_block["durationMs"], "stack": stack.split(";")[-8:]}
+        )
+        self._current_block = None
+
+    def _write_report(self, started_at: float) -> dict[str, Any]:
+        self._close_block()
+        output_dir = settings.PROFILE_OUTPUT_DIR or os.path.join(LOG_DIR, "profiles")
+        os.makedirs(output_dir, exist_ok=True)
+        prefix = os.path.join(
+            output_dir,
+            f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started_at))}-{os.getpid()}",
+        )
+        files = {"cpu": f"{prefix}.collapsed", "blocking": f"{prefix}.blocking.collapsed"}
+        for key, stacks in (("cpu", self.cpu_stacks), ("blocking", self.blocking_stacks)):
+            with open(files[key], "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        lags_ms = sorted(lag * 1000 for lag in self.lags)
+        report = {
+            "pid": os.getpid(),
+            "seconds": self.seconds,
+            "intervalMs": self.interval * 1000,
+            "samples": self.samples,
+            "idleSamples": self.idle_samples,
+            "loopLagMs": {
+                "max": round(lags_ms[-1], 2) if lags_ms else 0.0,
+                "p99": round(lags_ms[int(len(lags_ms) * 0.99)], 2) if lags_ms else 0.0,
+                "mean": round(sum(lags_ms) / len(lags_ms), 2) if lags_ms else 0.0,
+            },
+            "blockingEvents": sorted(
+                self.blocking_events, key=lambda e: e["durationMs"], reverse=True
+            )[:20],
+            "topFrames": [
+                {"frame": frame, "samples": count}
+                for frame, count in Counter(
+                    stack.rsplit(";", 1)[-1] for stack in self.cpu_stacks.elements()
+                ).most_common(20)
+            ],
+            "files": files,
+        }
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+_active_session: Optional[ProfileSession] = None
+# The loop only keeps weak references to tasks; signal-started sessions live here until done.
+_signal_tasks: set[asyncio.Task] = set()
+
+
+async def run_profile(
+    seconds: float, interval_ms: float = 5, block_threshold_ms: float = 50
+) -> dict[str, Any]:
+    global _active_session
+    if _active_session is not None:
+        raise ProfilerBusyError("A profile session is already running in this worker")
+    _active_session = ProfileSession(seconds, interval_ms, block_threshold_ms)
+    logger.info(f"Profiler started for {_active_session.seconds}s (pid {os.getpid()})")
+    try:
+        report = await _active_session.run()
+    finally:
+        _active_session = None
+    logger.info(f"Profiler finished, output: {report['files']['cpu']}")
+    return report
+
+
+def install_signal_handler(seconds: float) -> bool:
+    """`kill -USR2 <pid>` profiles that worker for `seconds` without an HTTP round trip."""
+    if not hasattr(signal, "SIGUSR2"):
+        return False
+    loop = asyncio.get_running_loop()
+
+    async def _run() -> None:
+        try:
+            await run_profile(seconds)
+        except ProfilerBusyError as e:
+            logger.warning(str(e))
+
+    def _start() -> None:
+        task = loop.create_task(_run())
+        _signal_tasks.add(task)
+        task.add_done_callback(_signal_tasks.discard)
+
+    loop.add_signal_handler(signal.SIGUSR2, _start)
+    return True
@@ -0,0 +1,18 @@
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis
+
+_client: Optional["redis.Redis"] = None
+
+
+def get_redis_client() -> "redis.Redis":
+    """Process-wide client; redis is imported and the pool opened only on first use."""
+    global _client
+    if _client is None:
+        import redis.asyncio as redis
+
+        _client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    return _client
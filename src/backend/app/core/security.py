@@ -1,26 +1,33 @@
+import secrets
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
-from jose import jwt
-from passlib.context import CryptContext
-
 from app.core.config import settings
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    # passlib + bcrypt are only loaded by routes that actually hash passwords.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
+
     if not settings.SECRET_KEY:
         raise RuntimeError("SECRET_KEY is not configured")
     to_encode = data.copy()
@@ -31,3 +38,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+def is_valid_debug_token(token: str) -> bool:
+    """Constant-time check against DEBUG_API_TOKEN; always False when no token is configured."""
+    return bool(settings.DEBUG_API_TOKEN) and secrets.compare_digest(
+        token.encode("utf-8"), settings.DEBUG_API_TOKEN.encode("utf-8")
+    )
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from typing import NamedTuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Loaded on first use (mail, auth/crypto, geocoding, Redis, upstream HTTP), never by `import main`.
+LAZY_MODULES = ("httpx", "redis", "fastapi_limiter", "jose", "passlib", "fastapi_mail")
+
+_TIMED_IMPORT = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = (time.perf_counter() - t) * 1000\n"
+    "print(elapsed, ','.join(m for m in {lazy!r} if m in sys.modules), sep='|')\n"
+)
+
+
+class ImportTiming(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def _run_fresh(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure_cold_import(module: str = "main", runs: int = 3) -> tuple[float, list[str]]:
+    """Best-of-`runs` wall time (ms) of importing `module` in a fresh interpreter, plus any
+    LAZY_MODULES that import pulled in."""
+    best = float("inf")
+    loaded: list[str] = []
+    for _ in range(runs):
+        out = _run_fresh(["-c", _TIMED_IMPORT.format(module=module, lazy=LAZY_MODULES)])
+        elapsed, modules = out.stdout.strip().splitlines()[-1].split("|")
+        best = min(best, float(elapsed))
+        loaded = [m for m in modules.split(",") if m]
+    return best, loaded
+
+
+def import_time_report(module: str = "main") -> list[ImportTiming]:
+    """Parse `python -X importtime` output for a fresh import of `module`."""
+    out = _run_fresh(["-X", "importtime", "-c", f"import {module}"])
+    timings = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
@@ -0,0 +1,354 @@
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from app.core.config import settings
+from app.core.logger import LOG_DIR, logger
+
+MAX_SPANS_PER_TRACE = 256
+
+# --- Context ---
+# Both vars stay None for unsampled requests, so every instrumentation point
+# costs a single ContextVar lookup when tracing is off.
+_current_trace: ContextVar[Optional["TraceContext"]] = ContextVar("trace", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("span_id", default=None)
+
+
+@dataclass
+class TraceContext:
+    trace_id: str
+    start_ns: int
+
+
+@dataclass
+class SpanRecord:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start_ns: int
+    end_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        """OTLP/JSON span shape; the request id is hashed into a 16-byte trace id."""
+        span = {
+            "traceId": hashlib.md5(self.trace_id.encode("utf-8")).hexdigest(),
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": "request_id", "value": {"stringValue": self.trace_id}},
+                *(
+                    {"key": key, "value": {"stringValue": str(value)}}
+                    for key, value in self.attributes.items()
+                ),
+            ],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+# --- Exporters ---
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, span: SpanRecord) -> None:
+        """Called on the event loop for every finished span; must not block."""
+
+
+class JsonlFileExporter(SpanExporter):
+    """
+    One OTLP/JSON span per line, ready for an OTLP file receiver or jq.
+
+    export() only enqueues; a background thread serializes and appends in batches,
+    so tracing never puts file I/O on the event loop.
+    """
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self.dropped = 0
+        self._queue: "queue.Queue[SpanRecord]" = queue.Queue(maxsize=max_queue)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def export(self, span: SpanRecord) -> None:
+        if self._writer is None:
+            self._start_writer()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every span passed to export() has been written."""
+        self._queue.join()
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="trace-exporter", daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                lines = "".join(
+                    json.dumps(span.to_otlp(), ensure_ascii=False) + "\n" for span in batch
+                )
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+            except Exception as e:
+                logger.warning(f"Trace export failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+def build_exporter(name: str, path: str = "") -> Optional[SpanExporter]:
+    if not name:
+        return None
+    if name == "file":
+        return JsonlFileExporter(path or os.path.join(LOG_DIR, "traces.jsonl"))
+    raise ValueError(f"Unknown trace exporter: {name}")
+
+
+# --- Spans ---
+class Span:
+    __slots__ = (
+        "_tracer",
+        "_trace_id",
+        "_token",
+        "span_id",
+        "parent_id",
+        "name",
+        "start_ns",
+        "attributes",
+        "_ended",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        trace_id: str,
+        name: str,
+        parent_id: Optional[str],
+        attributes: dict[str, Any],
+    ):
+        self._tracer = tracer
+        self._trace_id = trace_id
+        self._token: Optional[Token] = None
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.attributes = attributes
+        self._ended = False
+
+    @property
+    def ended(self) -> bool:
+        return self._ended
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        self._tracer._finish(
+            SpanRecord(
+                trace_id=self._trace_id,
+                span_id=self.span_id,
+                parent_id=self.parent_id,
+                name=self.name,
+                start_ns=self.start_ns,
+                end_ns=time.time_ns(),
+                attributes=self.attributes,
+            )
+        )
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span_id.set(self.span_id)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        if self._token is not None:
+            _current_span_id.reset(self._token)
+        self.end()
+
+
+class _NoopSpan:
+    __slots__ = ()
+    span_id = None
+    ended = True
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(
+        self, sample_rate: float, buffer_size: int, exporter: Optional[SpanExporter] = None
+    ):
+        self.sample_rate = sample_rate
+        self.buffer_size = buffer_size
+        self.exporter = exporter
+        self._traces: "OrderedDict[str, list[SpanRecord]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start_trace(self, trace_id: str, force: bool = False) -> Optional[Token]:
+        if not force and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return None
+        return _current_trace.set(TraceContext(trace_id=trace_id, start_ns=time.time_ns()))
+
+    def detach(self, token: Optional[Token]) -> None:
+        if token is not None:
+            _current_trace.reset(token)
+
+    @contextmanager
+    def activate(self, span: Any) -> Iterator[None]:
+        """Make span the ambient parent for the block without ending it on exit."""
+        token = _current_span_id.set(span.span_id)
+        try:
+            yield
+        finally:
+            _current_span_id.reset(token)
+
+    def start_span(self, name: str, parent: Any = None, **attributes: Any):
+        trace = _current_trace.get()
+        if trace is None:
+            return NOOP_SPAN
+        parent_id = parent.span_id if parent is not None else _current_span_id.get()
+        return Span(self, trace.trace_id, name, parent_id, attributes)
+
+    def record_since_request_start(self, name: str, **attributes: Any) -> None:
+        """Emit a span covering the gap from trace start to now, e.g. routing + validation
+        that happens before the handler body runs."""
+        trace = _current_trace.get()
+        if trace is None:
+            return
+        self._finish(
+            SpanRecord(
+                trace_id=trace.trace_id,
+                span_id=os.urandom(8).hex(),
+                parent_id=_current_span_id.get(),
+                name=name,
+                start_ns=trace.start_ns,
+                end_ns=time.time_ns(),
+                attributes=attributes,
+            )
+        )
+
+    def get_trace(self, trace_id: str) -> list[SpanRecord]:
+        with self._lock:
+            return sorted(self._traces.get(trace_id, []), key=lambda s: s.start_ns)
+
+    def _finish(self, record: SpanRecord) -> None:
+        with self._lock:
+            spans = self._traces.get(record.trace_id)
+            if spans is None:
+                spans = self._traces[record.trace_id] = []
+                while len(self._traces) > self.buffer_size:
+                    self._traces.popitem(last=False)
+            else:
+                self._traces.move_to_end(record.trace_id)
+            # Trace ids come from the client's X-Request-ID, so a reused id must not grow
+            # one trace without bound.
+            if len(spans) >= MAX_SPANS_PER_TRACE:
+                return
+            spans.append(record)
+        if self.exporter is not None:
+            try:
+                self.exporter.export(record)
+            except Exception as e:
+                logger.warning(f"Trace export failed: {e}")
+
+
+def render_timeline(spans: list[SpanRecord], width: int = 40) -> str:
+    """Plain-text waterfall of one trace, children indented under their parent."""
+    if not spans:
+        return ""
+    origin = min(s.start_ns for s in spans)
+    total_ns = max(max(s.end_ns for s in spans) - origin, 1)
+    ids = {s.span_id for s in spans}
+    children: dict[Optional[str], list[SpanRecord]] = {}
+    for s in spans:
+        children.setdefault(s.parent_id if s.parent_id in ids else None, []).append(s)
+
+    rows: list[tuple[int, SpanRecord]] = []
+
+    def walk(parent_id: Optional[str], depth: int) -> None:
+        for s in sorted(children.get(parent_id, []), key=lambda x: x.start_ns):
+            rows.append((depth, s))
+            walk(s.span_id, depth + 1)
+
+    walk(None, 0)
+    label_width = max(len("  " * depth + s.name) for depth, s in rows)
+    lines = [f"trace {spans[0].trace_id}  total {total_ns / 1e6:.1f}ms"]
+    for depth, s in rows:
+        start = int((s.start_ns - origin) * width / total_ns)
+        length = max(1, int((s.end_ns - s.start_ns) * width / total_ns))
+        bar = " " * start + "#" * min(length, width - start)
+        label = ("  " * depth + s.name).ljust(label_width)
+        offset_ms = (s.start_ns - origin) / 1e6
+        lines.append(f"{label} |{bar.ljust(width)}| +{offset_ms:8.1f}ms {s.duration_ms:8.1f}ms")
+    return "\n".join(lines)
+
+
+tracer = Tracer(
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+    buffer_size=settings.TRACE_BUFFER_SIZE,
+    exporter=build_exporter(settings.TRACE_EXPORTER, settings.TRACE_EXPORT_PATH),
+)
@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class TarotCardInfo(BaseModel):
@@ -20,6 +20,8 @@ class TarotRequest(BaseModel):
     spreadName: str
     spreadId: str
     drawnCards: List[DrawnCardInfo]
+    # "offline" skips the LLM and streams a reading composed from bundled card meanings.
+    readingMode: Literal["auto", "offline"] = "auto"
 
 
 class ChatMessage(BaseModel):
@@ -28,4 +30,16 @@ class ChatMessage(BaseModel):
 
 
 class TarotChatRequest(BaseModel):
-    messages: List[ChatMessage]
+    # Either the full history, or a server-held session (from /analyze) plus the new user turn.
+    messages: Optional[List[ChatMessage]] = None
+    sessionId: Optional[str] = Field(default=None, pattern=r"^[0-9a-f]{32}$")
+    message: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _check_history_source(self) -> "TarotChatRequest":
+        if self.sessionId:
+            if not self.message:
+                raise ValueError("message is required when sessionId is given")
+        elif self.messages is None:
+            raise ValueError("either messages or sessionId is required")
+        return self
@@ -0,0 +1,161 @@
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any
+
+from app.services.tarot_data_service import load_card_meanings, load_cards
+
+_TOKEN_RE = re.compile(r"[\u4e00-\u9fff]+|[a-z0-9]+")
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+
+# Field weights for the BM25 term frequency: a hit in the card name outranks one
+# buried in the meaning text.
+FIELD_WEIGHTS = {"name": 3.0, "keywords": 2.0, "meaning": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_EXPANSION = 20
+
+
+def tokenize(text: str, *, for_query: bool = False) -> list[str]:
+    """
+    中文按字二元组切分，拉丁字母按单词切分。
+
+    索引时额外保留单字，使单字查询（如“爱”）也能命中；
+    查询时只用二元组，避免多字查询被单字噪声稀释。
+    """
+    tokens: list[str] = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if not _CJK_RE.match(run):
+            tokens.append(run)
+            continue
+        if len(run) == 1:
+            tokens.append(run)
+            continue
+        tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        if not for_query:
+            tokens.extend(run)
+    return tokens
+
+
+class CardSearchIndex:
+    def __init__(self, cards: list[dict[str, Any]], meanings: dict[str, dict[str, str]]):
+        self.cards = cards
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._doc_lengths: list[float] = []
+        self._suggest_keys: list[tuple[str, int, str]] = []
+
+        for doc_id, card in enumerate(cards):
+            meaning = meanings.get(card["englishName"], {})
+            fields = {
+                "name": f"{card['name']} {card['englishName']}",
+                "keywords": " ".join(
+                    card.get("uprightKeywords", []) + card.get("reversedKeywords", [])
+                ),
+                "meaning": " ".join(
+                    (
+                        meaning.get("upright") or card.get("uprightMeaning", ""),
+                        meaning.get("reversed") or card.get("reversedMeaning", ""),
+                    )
+                ),
+            }
+            doc_length = 0.0
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    postings = self._postings[token]
+                    postings[doc_id] = postings.get(doc_id, 0.0) + weight
+                    doc_length += weight
+            self._doc_lengths.append(doc_length)
+
+            english = card["englishName"]
+            suggest_texts = [card["name"], english] + card.get("uprightKeywords", [])
+            if english.lower().startswith("the "):
+                suggest_texts.append(english[4:])
+            for text in suggest_texts:
+                self._suggest_keys.append((text.lower(), doc_id, text))
+
+        self._avg_doc_length = sum(self._doc_lengths) / max(len(self._doc_lengths), 1)
+        self._latin_vocab = sorted(t for t in self._postings if not _CJK_RE.match(t))
+        self._suggest_keys.sort()
+        self._rank = lru_cache(maxsize=1024)(self._rank_uncached)
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        start = bisect_left(self._latin_vocab, prefix)
+        terms = []
+        for term in self._latin_vocab[start : start + MAX_PREFIX_EXPANSION]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _rank_uncached(self, query: str) -> tuple[tuple[int, float], ...]:
+        if not query.strip():
+            return tuple((doc_id, 0.0) for doc_id in range(len(self.cards)))
+
+        tokens = list(dict.fromkeys(tokenize(query, for_query=True)))
+        if not tokens:
+            return ()
+        # Search-as-you-type: a trailing partial English word matches every word it prefixes.
+        term_groups = [[t] for t in tokens]
+        if not query.endswith(" ") and not _CJK_RE.match(tokens[-1]):
+            term_groups[-1] = self._expand_prefix(tokens[-1]) or [tokens[-1]]
+
+        total_docs = len(self.cards)
+        scores: dict[int, float] = defaultdict(float)
+        for group in term_groups:
+            for term in group:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = 1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / self._avg_doc_length
+                    scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return tuple(sorted(scores.items(), key=lambda item: (-item[1], item[0])))
+
+    def search(self, query: str, page: int = 1, size: int = 20) -> dict[str, Any]:
+        """Ranked, paginated results; an empty query lists the whole deck in order."""
+        ranked = self._rank(query.lstrip().lower())
+        start = (page - 1) * size
+        return {
+            "query": query,
+            "total": len(ranked),
+            "page": page,
+            "size": size,
+            "results": [
+                {**self.cards[doc_id], "score": round(score, 4)}
+                for doc_id, score in ranked[start : start + size]
+            ],
+        }
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[dict[str, Any]]:
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        suggestions: list[dict[str, Any]] = []
+        seen: set[int] = set()
+        for key, doc_id, text in self._suggest_keys[bisect_left(self._suggest_keys, (prefix,)) :]:
+            if not key.startswith(prefix):
+                break
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            card = self.cards[doc_id]
+            suggestions.append(
+                {
+                    "text": text,
+                    "id": card["id"],
+                    "name": card["name"],
+                    "englishName": card["englishName"],
+                }
+            )
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+
+@lru_cache(maxsize=1)
+def get_card_search_index() -> CardSearchIndex:
+    return CardSearchIndex(load_cards(), load_card_meanings())
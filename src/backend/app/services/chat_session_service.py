@@ -0,0 +1,92 @@
+import json
+import uuid
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+SESSION_KEY_PREFIX = "chat_session:"
+APPEND_RETRIES = 5
+
+
+class ChatSessionFullError(Exception):
+    pass
+
+
+class ChatSessionConflictError(Exception):
+    pass
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _encode(message: dict[str, str]) -> str:
+    return json.dumps(
+        [message["role"], message["content"]], ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def _decode(raw: str) -> dict[str, str]:
+    role, content = json.loads(raw)
+    return {"role": role, "content": content}
+
+
+class ChatSessionStore:
+    """
+    每个会话是一个 Redis 列表，元素为紧凑 JSON `[role, content]`，只追加不改写。
+
+    每次追加都会续期 TTL，长时间无人追问的会话自然过期。
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any] = get_redis_client,
+        ttl_seconds: int = settings.CHAT_SESSION_TTL_SECONDS,
+        max_messages: int = settings.CHAT_SESSION_MAX_MESSAGES,
+    ):
+        self._client_factory = client_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+
+    async def append(self, session_id: str, messages: list[dict[str, str]]) -> None:
+        """
+        Append atomically, enforcing max_messages against the stored length.
+
+        The length is read under WATCH, so two concurrent turns on one session cannot
+        both pass the cap; a turn that loses the race re-checks against the new length.
+        """
+        from redis.exceptions import WatchError
+
+        key = SESSION_KEY_PREFIX + session_id
+        for _ in range(APPEND_RETRIES):
+            async with self._client_factory().pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    length = await pipe.llen(key)
+                    if length + len(messages) > self.max_messages:
+                        raise ChatSessionFullError(
+                            f"Chat session is full (max {self.max_messages} messages)"
+                        )
+                    pipe.multi()
+                    pipe.rpush(key, *(_encode(m) for m in messages))
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+        raise ChatSessionConflictError(f"Chat session {session_id} is being modified concurrently")
+
+    async def load(self, session_id: str) -> Optional[list[dict[str, str]]]:
+        """Full history, or None if the session never existed or has expired."""
+        raw = await self._client_factory().lrange(SESSION_KEY_PREFIX + session_id, 0, -1)
+        if not raw:
+            return None
+        return [_decode(item) for item in raw]
+
+    def ensure_capacity(self, history: list[dict[str, str]], incoming: int) -> None:
+        if len(history) + incoming > self.max_messages:
+            raise ChatSessionFullError(f"Chat session is full (max {self.max_messages} messages)")
+
+
+chat_session_store = ChatSessionStore()
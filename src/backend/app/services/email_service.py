@@ -1,18 +1,17 @@
 import random
 import string
 
-import redis.asyncio as redis
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
 from pydantic import EmailStr
 
+from app.core.redis_client import get_redis_client
 from app.services.settings_service import SettingsService
 
-redis_client = redis.from_url("redis://localhost:6379", encoding="utf-8", decode_responses=True)
-
 
 class EmailService:
     @staticmethod
     def _get_conf():
+        from fastapi_mail import ConnectionConfig
+
         return ConnectionConfig(
             MAIL_USERNAME=SettingsService.get("MAIL_USERNAME"),
             MAIL_PASSWORD=SettingsService.get("MAIL_PASSWORD"),
@@ -32,7 +31,7 @@ class EmailService:
     @staticmethod
     async def send_verification_code(email: EmailStr) -> bool:
         code = EmailService.generate_code()
-        await redis_client.set(f"verify_code:{email}", code, ex=300)
+        await get_redis_client().set(f"verify_code:{email}", code, ex=300)
 
         html = f"""
         <div style="background-color: #f5f5f0; padding: 20px; font-family: serif; color: #1c1917;">
@@ -50,6 +49,8 @@ class EmailService:
         </div>
         """
 
+        from fastapi_mail import FastMail, MessageSchema, MessageType
+
         message = MessageSchema(
             subject="【易朝】您的验证码", recipients=[email], body=html, subtype=MessageType.html
         )
@@ -64,6 +65,7 @@ class EmailService:
 
     @staticmethod
     async def verify_code(email: str, code: str) -> bool:
+        redis_client = get_redis_client()
         stored_code = await redis_client.get(f"verify_code:{email}")
         if stored_code and stored_code == code:
             await redis_client.delete(f"verify_code:{email}")
@@ -0,0 +1,115 @@
+from typing import AsyncGenerator, Optional
+
+from app.core.error_response import build_error_payload
+from app.core.logger import logger
+from app.core.tracing import tracer
+from app.schemas.tarot import DrawnCardInfo, TarotRequest
+from app.services.llm_stream_service import format_sse
+from app.services.tarot_data_service import get_card_meaning, get_spread_position
+
+
+def _content_frame(content: str) -> str:
+    # Same shape as an OpenAI-compatible delta so the frontend parser needs no changes.
+    return format_sse({"choices": [{"index": 0, "delta": {"content": content}}]})
+
+
+def _build_card_section(idx: int, dc: DrawnCardInfo, spread_id: str) -> str:
+    position = get_spread_position(spread_id, idx) or {}
+    position_name = position.get("name") or dc.position.get("name") or f"第{idx + 1}张"
+    position_desc = position.get("description") or dc.position.get("description")
+    status = "逆位" if dc.isReversed else "正位"
+
+    meaning = get_card_meaning(dc.card.englishName)
+    if meaning:
+        card_meaning = meaning["reversed" if dc.isReversed else "upright"]
+    else:
+        card_meaning = "此牌暂无收录的牌意，请结合牌面意象自行体会。"
+
+    lines = [f"### {idx + 1}. {position_name} · {dc.card.name}（{status}）", ""]
+    if position_desc:
+        lines += [f"> {position_desc}", ""]
+    lines += [card_meaning, "", ""]
+    return "\n".join(lines)
+
+
+def _build_summary_section(req: TarotRequest) -> str:
+    total = len(req.drawnCards)
+    reversed_count = sum(1 for dc in req.drawnCards if dc.isReversed)
+    major_count = sum(1 for dc in req.drawnCards if dc.card.id.isdigit())
+
+    lines = ["## 整体指引", ""]
+    if total == 0:
+        lines.append("本次没有抽到牌面，请重新抽牌后再试。")
+    elif reversed_count == 0:
+        lines.append("所有牌均为正位，能量流动顺畅，当下适合主动推进。")
+    elif reversed_count * 2 > total:
+        lines.append(
+            f"{total} 张牌中有 {reversed_count} 张逆位，阻力多来自内在，"
+            "宜先放慢脚步、厘清顾虑，再做决定。"
+        )
+    else:
+        lines.append(
+            f"{total} 张牌中有 {reversed_count} 张逆位，整体趋势向好，"
+            "但需留意逆位牌所提示的薄弱环节。"
+        )
+    if total and major_count * 2 >= total:
+        lines.append("")
+        lines.append("大阿卡纳占比较高，这件事与人生阶段性的课题相关，值得认真对待。")
+    lines += [
+        "",
+        "---",
+        "",
+        "*当前为离线速览模式，解读基于传统牌意组合生成；服务恢复后可重新获取完整的深度解读。*",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def build_fallback_sections(req: TarotRequest) -> list[str]:
+    """按段落拼装离线解读 Markdown，结果完全由请求内容决定。"""
+    header = "\n".join(
+        [
+            "## 牌阵速览",
+            "",
+            f"**问题**：{req.question}",
+            "",
+            f"**牌阵**：{req.spreadName}",
+            "",
+            "",
+        ]
+    )
+    sections = [header]
+    sections += [
+        _build_card_section(idx, dc, req.spreadId) for idx, dc in enumerate(req.drawnCards)
+    ]
+    sections.append(_build_summary_section(req))
+    return sections
+
+
+def build_fallback_reading(req: TarotRequest) -> str:
+    return "".join(build_fallback_sections(req))
+
+
+async def stream_fallback_reading(
+    req: TarotRequest,
+    request_id: Optional[str] = None,
+    reason: str = "requested",
+) -> AsyncGenerator[str, None]:
+    logger.info("[rid:%s] Serving offline fallback reading (%s)", request_id or "-", reason)
+    try:
+        with tracer.start_span("fallback.build"):
+            sections = build_fallback_sections(req)
+    except Exception as exc:
+        logger.exception("[rid:%s] Fallback reading failed: %s", request_id or "-", exc)
+        yield format_sse(
+            build_error_payload(
+                "Fallback reading failed",
+                code="FALLBACK_READING_ERROR",
+                status=500,
+                detail=str(exc),
+            )
+        )
+        return
+    for section in sections:
+        yield _content_frame(section)
+    yield "data: [DONE]\n\n"
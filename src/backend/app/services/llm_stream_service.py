@@ -1,10 +1,9 @@
 import json
 from typing import Any, AsyncGenerator, Iterable, Optional
 
-import httpx
-
 from app.core.error_response import build_error_payload
 from app.core.logger import logger
+from app.core.tracing import NOOP_SPAN, tracer
 
 SSE_HEADERS = {
     "Cache-Control": "no-cache",
@@ -12,10 +11,29 @@ SSE_HEADERS = {
     "X-Accel-Buffering": "no",
 }
 
+
 def format_sse(payload: dict[str, Any]) -> str:
     return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
 
+def parse_sse_content(chunk: str) -> tuple[str, bool]:
+    """Return (delta content, is_error) for one SSE `data:` frame."""
+    data = chunk[len("data:") :].strip() if chunk.startswith("data:") else ""
+    if not data or data == "[DONE]":
+        return "", False
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return "", False
+    if not isinstance(payload, dict):
+        return "", False
+    if "error" in payload:
+        return "", True
+    choices = payload.get("choices") or [{}]
+    content = (choices[0].get("delta") or {}).get("content") or payload.get("content") or ""
+    return content, False
+
+
 async def stream_chat_completion(
     *,
     api_key: str,
@@ -24,6 +42,8 @@ async def stream_chat_completion(
     messages: Iterable[dict[str, str]],
     request_id: Optional[str] = None,
 ) -> AsyncGenerator[str, None]:
+    import httpx
+
     timeout = httpx.Timeout(connect=10.0, read=70.0, write=20.0, pool=20.0)
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -37,6 +57,15 @@ async def stream_chat_completion(
         "stream": True,
     }
 
+    # Spans are ended explicitly rather than entered: this generator is resumed once per
+    # chunk and must not leave its span as the ambient parent in between.
+    stream_span = tracer.start_span("llm.stream", model=model)
+    connect_span = tracer.start_span("llm.connect", parent=stream_span)
+    ttft_span = tracer.start_span("llm.ttft", parent=stream_span)
+    tail_span = NOOP_SPAN
+    chunk_count = 0
+    error: Optional[str] = None
+
     async with httpx.AsyncClient(timeout=timeout) as client:
         try:
             async with client.stream(
@@ -45,7 +74,10 @@ async def stream_chat_completion(
                 headers=headers,
                 json=payload,
             ) as response:
+                connect_span.set_attribute("status", response.status_code)
+                connect_span.end()
                 if response.status_code != 200:
+                    error = f"http_{response.status_code}"
                     detail = (await response.aread()).decode("utf-8", errors="ignore")[:500]
                     logger.error(
                         "[rid:%s] LLM upstream request failed. status=%s body=%s",
@@ -65,8 +97,13 @@ async def stream_chat_completion(
 
                 async for line in response.aiter_lines():
                     if line.startswith("data:"):
+                        if chunk_count == 0:
+                            ttft_span.end()
+                            tail_span = tracer.start_span("llm.tail", parent=stream_span)
+                        chunk_count += 1
                         yield f"{line.strip()}\n\n"
-        except httpx.TimeoutException:
+        except httpx.TimeoutException as exc:
+            error = type(exc).__name__
             logger.warning("[rid:%s] LLM upstream timeout", request_id or "-")
             yield format_sse(
                 build_error_payload(
@@ -76,6 +113,7 @@ async def stream_chat_completion(
                 )
             )
         except Exception as exc:
+            error = type(exc).__name__
             logger.exception("[rid:%s] LLM stream failed: %s", request_id or "-", exc)
             yield format_sse(
                 build_error_payload(
@@ -85,3 +123,15 @@ async def stream_chat_completion(
                     detail=str(exc),
                 )
             )
+        finally:
+            # Failed or abandoned streams never reach the normal end of connect/ttft; close
+            # them here so the timeline still shows where the request stopped.
+            for span in (connect_span, ttft_span):
+                if not span.ended:
+                    span.set_attribute("error", error or "aborted")
+                    span.end()
+            tail_span.end()
+            if error:
+                stream_span.set_attribute("error", error)
+            stream_span.set_attribute("chunks", chunk_count)
+            stream_span.end()
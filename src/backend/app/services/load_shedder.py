@@ -0,0 +1,85 @@
+import time
+from collections import deque
+from typing import Optional
+
+from app.core.config import settings
+
+
+class LoadShedder:
+    """
+    跟踪进行中的 LLM 流、最近的首包延迟与上游错误率，超过阈值时建议改用离线解读。
+
+    首帧即为错误帧（如 429/5xx）的请求不计入延迟，而是计入错误率，
+    否则快速失败的上游会拉低平均延迟、反而阻止分流。
+    样本只在滑动窗口内生效：一旦开始分流、没有新的 LLM 请求，
+    旧样本会自然过期，系统随之恢复到 LLM 模式。
+    """
+
+    def __init__(
+        self,
+        max_inflight: int,
+        latency_threshold_ms: int,
+        window_seconds: int,
+        error_rate_threshold: float = 0.0,
+        min_error_samples: int = 5,
+    ):
+        self.max_inflight = max_inflight
+        self.latency_threshold_ms = latency_threshold_ms
+        self.window_seconds = window_seconds
+        self.error_rate_threshold = error_rate_threshold
+        self.min_error_samples = min_error_samples
+        self.inflight = 0
+        # (timestamp, first-chunk latency in ms, or None for an upstream error)
+        self._samples: deque[tuple[float, Optional[float]]] = deque(maxlen=256)
+
+    def begin(self) -> None:
+        self.inflight += 1
+
+    def end(self) -> None:
+        self.inflight = max(0, self.inflight - 1)
+
+    def record_latency(self, latency_ms: float, now: Optional[float] = None) -> None:
+        self._samples.append((now if now is not None else time.monotonic(), latency_ms))
+
+    def record_error(self, now: Optional[float] = None) -> None:
+        self._samples.append((now if now is not None else time.monotonic(), None))
+
+    def _recent_samples(self, now: Optional[float]) -> deque[tuple[float, Optional[float]]]:
+        cutoff = (now if now is not None else time.monotonic()) - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return self._samples
+
+    def recent_latency_ms(self, now: Optional[float] = None) -> float:
+        latencies = [lat for _, lat in self._recent_samples(now) if lat is not None]
+        if not latencies:
+            return 0.0
+        return sum(latencies) / len(latencies)
+
+    def recent_error_rate(self, now: Optional[float] = None) -> float:
+        samples = self._recent_samples(now)
+        if not samples or len(samples) < self.min_error_samples:
+            return 0.0
+        return sum(1 for _, lat in samples if lat is None) / len(samples)
+
+    def shed_reason(self, now: Optional[float] = None) -> Optional[str]:
+        if self.max_inflight and self.inflight >= self.max_inflight:
+            return f"inflight={self.inflight}"
+        if self.latency_threshold_ms:
+            latency = self.recent_latency_ms(now)
+            if latency >= self.latency_threshold_ms:
+                return f"latency={latency:.0f}ms"
+        if self.error_rate_threshold:
+            error_rate = self.recent_error_rate(now)
+            if error_rate >= self.error_rate_threshold:
+                return f"error_rate={error_rate:.0%}"
+        return None
+
+
+llm_load_shedder = LoadShedder(
+    max_inflight=settings.LLM_SHED_MAX_INFLIGHT,
+    latency_threshold_ms=settings.LLM_SHED_LATENCY_MS,
+    window_seconds=settings.LLM_SHED_WINDOW_SECONDS,
+    error_rate_threshold=settings.LLM_SHED_ERROR_RATE,
+    min_error_samples=settings.LLM_SHED_MIN_ERROR_SAMPLES,
+)
@@ -1,7 +1,5 @@
 from typing import Optional, Tuple
 
-import httpx
-
 from app.core.config import settings
 
 
@@ -14,6 +12,8 @@ async def get_coordinates_by_address(address: str) -> Optional[Tuple[float, floa
         print("Warning: AMAP_API_KEY is not set.")
         return None
 
+    import httpx
+
     url = "https://restapi.amap.com/v3/geocode/geo"
     params = {"key": settings.AMAP_API_KEY, "address": address, "output": "json"}
 
@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+from app.core.config import settings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "web", "data")
+# Built from tarot-cards.json, tarot_meanings_zh.json and spreads.json by web/data/build_data.py
+BUNDLE_FILE = "tarot-bundle.json"
+
+
+def get_data_dir() -> str:
+    return settings.TAROT_DATA_DIR or DEFAULT_DATA_DIR
+
+
+@lru_cache(maxsize=1)
+def load_bundle() -> dict[str, Any]:
+    path = os.path.join(get_data_dir(), BUNDLE_FILE)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return json.loads(f.read())
+    gz_path = f"{path}.gz"
+    if os.path.exists(gz_path):
+        with gzip.open(gz_path, "rb") as f:
+            return json.loads(f.read())
+    raise FileNotFoundError(f"{path} not found; run: python web/data/build_data.py")
+
+
+def load_cards() -> list[dict[str, Any]]:
+    """All 78 cards in deck order, meanings joined: major arcana, then wands, cups, swords,
+    pentacles."""
+    return load_bundle()["cards"]
+
+
+@lru_cache(maxsize=1)
+def load_card_meanings() -> dict[str, dict[str, str]]:
+    """englishName -> {"upright": ..., "reversed": ...}"""
+    return {
+        card["englishName"]: {
+            "upright": card["uprightMeaning"],
+            "reversed": card["reversedMeaning"],
+        }
+        for card in load_cards()
+    }
+
+
+@lru_cache(maxsize=1)
+def load_spreads() -> dict[str, dict[str, Any]]:
+    """spread id -> spread definition (with ordered positions)"""
+    return {spread["id"]: spread for spread in load_bundle()["spreads"]}
+
+
+def get_card_meaning(english_name: str) -> Optional[dict[str, str]]:
+    return load_card_meanings().get(english_name)
+
+
+def get_spread_position(spread_id: str, index: int) -> Optional[dict[str, Any]]:
+    spread = load_spreads().get(spread_id)
+    if not spread or index >= len(spread["positions"]):
+        return None
+    return spread["positions"][index]
+
+
+def clear_cache() -> None:
+    load_bundle.cache_clear()
+    load_card_meanings.cache_clear()
+    load_spreads.cache_clear()
@@ -11,16 +11,21 @@ except ImportError:
 
 load_dotenv()
 
-import redis.asyncio as redis
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
 
 from app.api.api import api_router
 from app.core.config import settings
 from app.core.error_response import build_error_payload
 from app.core.logger import logger
+from app.core.profiler import install_signal_handler
+from app.core.redis_client import get_redis_client
+from app.core.security import is_valid_debug_token
+from app.core.tracing import tracer
+from app.services.card_search_service import get_card_search_index
+from app.services.tarot_data_service import load_card_meanings, load_spreads
 
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
@@ -32,16 +37,29 @@ async def lifespan(app: FastAPI):
         raise RuntimeError("SECRET_KEY is required. Please configure it in backend/.env")
 
     try:
-        redis_instance = redis.from_url(
-            settings.REDIS_URL, encoding="utf-8", decode_responses=True
-        )
-        await FastAPILimiter.init(redis_instance)
+        from fastapi_limiter import FastAPILimiter
+
+        await FastAPILimiter.init(get_redis_client())
         logger.info("Redis Limiter initialized")
     except Exception as e:
         logger.warning(
             f"Redis Limiter failed to initialize: {e}. Rate limiting will be disabled."
         )
 
+    try:
+        load_card_meanings()
+        load_spreads()
+        get_card_search_index()
+    except Exception as e:
+        logger.warning(
+            f"Tarot data failed to load: {e}. Offline readings and card search will fail."
+        )
+
+    if settings.PROFILER_SIGNAL_SECONDS and install_signal_handler(
+        settings.PROFILER_SIGNAL_SECONDS
+    ):
+        logger.info(f"Profiler signal handler installed (SIGUSR2, pid {os.getpid()})")
+
     yield
 
 
@@ -63,6 +81,7 @@ app.add_middleware(
     allow_credentials=not allow_all_origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Chat-Session-ID", "X-Reading-Mode"],
 )
 
 
@@ -89,27 +108,50 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "Validation failed",
             code="VALIDATION_ERROR",
             status=422,
-            detail=exc.errors(),
+            detail=jsonable_encoder(exc.errors()),
         ),
     )
 
 
+async def _end_span_after_body(body_iterator, span):
+    # call_next returns once headers are ready; a streamed (SSE) body is still being
+    # produced, so the request span ends when the body does.
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        span.end()
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
     request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
     request.state.request_id = request_id
+    # Forced sampling is a debug feature: anonymous clients must not be able to fill the
+    # trace buffer or switch on export for their own requests.
+    force_trace = request.headers.get("X-Trace-Sample") == "1" and is_valid_debug_token(
+        request.headers.get("X-Debug-Token", "")
+    )
+    trace_token = tracer.start_trace(request_id, force=force_trace)
+    span = tracer.start_span("http.request", method=request.method, path=request.url.path)
     try:
-        response = await call_next(request)
+        with tracer.activate(span):
+            response = await call_next(request)
+        span.set_attribute("status", response.status_code)
+        response.body_iterator = _end_span_after_body(response.body_iterator, span)
         response.headers["X-Request-ID"] = request_id
         return response
-    except Exception:
+    except Exception as e:
+        span.set_attribute("error", type(e).__name__)
+        span.end()
         process_time = (time.time() - start_time) * 1000
         logger.exception(
             f"[rid:{request_id}] {request.method} {request.url.path} - 500 - {process_time:.2f}ms (unhandled error)"
         )
         raise
     finally:
+        tracer.detach(trace_token)
         process_time = (time.time() - start_time) * 1000
         if "response" in locals():
             logger.info(
@@ -0,0 +1,39 @@
+"""
+冷启动导入耗时报告：
+
+    python scripts/import_profile.py [--top 20] [--budget-ms 1500]
+
+在全新解释器中导入 main，列出累计耗时最高的模块；超出预算时以非零状态退出。
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.core.startup_profile import import_time_report, measure_cold_import  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=settings.STARTUP_IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    timings = import_time_report(args.module)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[: args.top]:
+        print(f"{t.cumulative_us / 1000:14.1f} {t.self_us / 1000:9.1f}  {'  ' * t.depth}{t.name}")
+
+    elapsed_ms, eager = measure_cold_import(args.module)
+    print(f"\ncold import of {args.module}: {elapsed_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+    if eager:
+        print(f"lazy subsystems imported eagerly: {', '.join(eager)}")
+    return 0 if elapsed_ms <= args.budget_ms and not eager else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# Must be set before app.core.logger is imported by any test module.
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="easydynasty-test-logs-")
+
+import asyncio  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from main import app  # noqa: E402
+
+
+@pytest.fixture
+def llm_settings(monkeypatch):
+    """A secret key and a dummy LLM API key for the duration of one test."""
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(settings, "DEFAULT_LLM_API_KEY", "dummy-key")
+
+
+@pytest.fixture
+def analyze_payload():
+    """Build a valid /tarot/analyze body; keyword arguments replace top-level fields."""
+
+    def build(**overrides) -> dict:
+        payload = {
+            "question": "测试问题",
+            "spreadName": "单张牌",
+            "spreadId": "single_card",
+            "drawnCards": [
+                {
+                    "card": {"id": "0", "name": "愚者", "englishName": "The Fool"},
+                    "isReversed": False,
+                    "position": {"id": 1, "name": "现状", "description": "当前状态"},
+                }
+            ],
+        }
+        payload.update(overrides)
+        return payload
+
+    return build
+
+
+@pytest.fixture
+def api_client():
+    """Run `await fn(client)` against the app in-process and return its result."""
+
+    def run(fn):
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await fn(client)
+
+        return asyncio.run(main())
+
+    return run
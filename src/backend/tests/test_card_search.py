@@ -0,0 +1,47 @@
+from app.services.card_search_service import get_card_search_index, tokenize
+
+
+def test_tokenize_uses_chinese_bigrams():
+    assert tokenize("权杖王牌", for_query=True) == ["权杖", "杖王", "王牌"]
+    assert "权" in tokenize("权杖王牌")
+    assert tokenize("The Fool") == ["the", "fool"]
+
+
+def test_search_ranks_name_hits_first():
+    index = get_card_search_index()
+
+    assert index.search("愚人")["results"][0]["englishName"] == "The Fool"
+    assert index.search("the tower")["results"][0]["englishName"] == "The Tower"
+    assert index.search("权杖王牌")["results"][0]["englishName"] == "Ace of Wands"
+    # keyword/meaning hits, not just names
+    assert index.search("新开始")["total"] > 1
+
+
+def test_search_prefix_and_pagination():
+    index = get_card_search_index()
+
+    wands = index.search("wan", page=1, size=5)
+    assert wands["total"] == 14
+    assert len(wands["results"]) == 5
+    assert index.search("wan", page=3, size=5)["results"][-1]["suit"] == "wands"
+
+    everything = index.search("", page=1, size=78)
+    assert everything["total"] == 78
+    assert everything["results"][0]["englishName"] == "The Fool"
+
+
+def test_suggest_matches_card_name_prefixes():
+    index = get_card_search_index()
+
+    assert [s["englishName"] for s in index.suggest("foo")] == ["The Fool"]
+    assert all(s["name"].startswith("权杖") for s in index.suggest("权杖", limit=3))
+    assert index.suggest("") == []
+
+
+def test_search_endpoint(api_client):
+    res = api_client(lambda c: c.get("/api/v1/tarot/cards/search", params={"q": "恋人", "size": 2}))
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["results"][0]["englishName"] == "The Lovers"
+    assert "uprightMeaning" in body["results"][0]
@@ -0,0 +1,211 @@
+import asyncio
+
+import pytest
+from redis.exceptions import WatchError
+
+from app.services.chat_session_service import (
+    SESSION_KEY_PREFIX,
+    ChatSessionFullError,
+    ChatSessionStore,
+    chat_session_store,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+        self._watched = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def watch(self, key):
+        self._watched[key] = self._redis.versions.get(key, 0)
+
+    async def llen(self, key):
+        return len(self._redis.lists.get(key, []))
+
+    def multi(self):
+        pass
+
+    def rpush(self, key, *values):
+        self._ops.append(lambda: self._redis.lists.setdefault(key, []).extend(values))
+
+    def expire(self, key, seconds):
+        self._ops.append(lambda: self._redis.ttls.__setitem__(key, seconds))
+
+    async def execute(self):
+        for key, version in self._watched.items():
+            if self._redis.versions.get(key, 0) != version:
+                raise WatchError(key)
+        for op in self._ops:
+            op()
+        for key in self._watched:
+            self._redis.versions[key] = self._redis.versions.get(key, 0) + 1
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.ttls = {}
+        self.versions = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+
+class UnavailableRedis:
+    def pipeline(self, transaction=True):
+        raise ConnectionError("Error 111 connecting to 127.0.0.1:6399. Connection refused.")
+
+    async def lrange(self, key, start, end):
+        raise ConnectionError("Error 111 connecting to 127.0.0.1:6399. Connection refused.")
+
+
+def _setup(monkeypatch, reply: str):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(chat_session_store, "_client_factory", lambda: fake_redis)
+    upstream_calls = []
+
+    async def fake_stream_chat_completion(**kwargs):
+        upstream_calls.append(kwargs["messages"])
+        for part in (reply[:2], reply[2:]):
+            yield f'data: {{"choices":[{{"delta":{{"content":"{part}"}}}}]}}\n\n'
+        yield "data: [DONE]\n\n"
+
+    monkeypatch.setattr(
+        "app.api.endpoints.tarot.stream_chat_completion",
+        fake_stream_chat_completion,
+    )
+    return fake_redis, upstream_calls
+
+
+@pytest.fixture
+def post(llm_settings, api_client):
+    return lambda path, body: api_client(lambda c: c.post(path, json=body))
+
+
+def test_analyze_registers_session_and_chat_sends_only_new_turn(monkeypatch, post, analyze_payload):
+    fake_redis, upstream_calls = _setup(monkeypatch, "牌面解读")
+
+    res = post("/api/v1/tarot/analyze", analyze_payload())
+    session_id = res.headers.get("x-chat-session-id")
+
+    assert res.status_code == 200
+    assert session_id
+    stored = fake_redis.lists[SESSION_KEY_PREFIX + session_id]
+    assert len(stored) == 3
+    assert stored[2] == '["assistant","牌面解读"]'
+    assert fake_redis.ttls[SESSION_KEY_PREFIX + session_id] == chat_session_store.ttl_seconds
+
+    res = post("/api/v1/tarot/chat", {"sessionId": session_id, "message": "那我该怎么做？"})
+
+    assert res.status_code == 200
+    sent = upstream_calls[-1]
+    # date system message + stored analysis history + the new user turn
+    assert [m["role"] for m in sent] == ["system", "system", "user", "assistant", "user"]
+    assert sent[2] == upstream_calls[0][1]
+    assert sent[-1]["content"] == "那我该怎么做？"
+    assert len(fake_redis.lists[SESSION_KEY_PREFIX + session_id]) == 5
+
+
+def test_chat_with_unknown_session_returns_404(monkeypatch, post):
+    _setup(monkeypatch, "回复")
+
+    res = post("/api/v1/tarot/chat", {"sessionId": "0" * 32, "message": "你好"})
+
+    assert res.status_code == 404
+    assert res.json()["error"]["message"] == "Chat session not found or expired"
+
+
+def test_chat_requires_messages_or_session(monkeypatch, post):
+    _setup(monkeypatch, "回复")
+
+    assert post("/api/v1/tarot/chat", {}).status_code == 422
+    assert post("/api/v1/tarot/chat", {"sessionId": "0" * 32}).status_code == 422
+    assert (
+        post("/api/v1/tarot/chat", {"messages": [{"role": "user", "content": "hi"}]}).status_code
+        == 200
+    )
+
+
+def test_chat_session_store_unavailable_falls_back_to_full_history(
+    monkeypatch, post, analyze_payload
+):
+    _, upstream_calls = _setup(monkeypatch, "回复")
+    monkeypatch.setattr(chat_session_store, "_client_factory", lambda: UnavailableRedis())
+
+    # The reading still streams; only the session save is lost.
+    res = post("/api/v1/tarot/analyze", analyze_payload())
+    assert res.status_code == 200
+    assert "回复" in res.text
+    session_id = res.headers.get("x-chat-session-id")
+
+    res = post("/api/v1/tarot/chat", {"sessionId": session_id, "message": "然后呢？"})
+    assert res.status_code == 503
+
+    # What TarotChat does after a 404/409/503 on the session path.
+    history = upstream_calls[0] + [{"role": "assistant", "content": "回复"}]
+    res = post(
+        "/api/v1/tarot/chat",
+        {"messages": history + [{"role": "user", "content": "然后呢？"}]},
+    )
+    assert res.status_code == 200
+    assert upstream_calls[-1][-1]["content"] == "然后呢？"
+
+
+def test_append_enforces_cap_atomically_across_concurrent_turns():
+    fake_redis = FakeRedis()
+    store = ChatSessionStore(client_factory=lambda: fake_redis, ttl_seconds=60, max_messages=4)
+    turn = [{"role": "user", "content": "问"}, {"role": "assistant", "content": "答"}]
+
+    async def run():
+        await store.append("s", turn)
+        # Both turns loaded the same 2-message history and passed ensure_capacity.
+        history = await store.load("s")
+        store.ensure_capacity(history, incoming=2)
+        await store.append("s", turn)
+        with pytest.raises(ChatSessionFullError):
+            await store.append("s", turn)
+
+    asyncio.run(run())
+
+    assert len(fake_redis.lists[SESSION_KEY_PREFIX + "s"]) == 4
+
+
+def test_append_retries_after_a_concurrent_write():
+    fake_redis = FakeRedis()
+    store = ChatSessionStore(client_factory=lambda: fake_redis, ttl_seconds=60, max_messages=3)
+    key = SESSION_KEY_PREFIX + "s"
+    real_pipeline = fake_redis.pipeline
+
+    def racing_pipeline(transaction=True):
+        pipe = real_pipeline(transaction)
+        real_multi = pipe.multi
+
+        def multi():
+            # Another worker appends between our LLEN and EXEC, exactly once.
+            if not fake_redis.lists.get(key):
+                fake_redis.lists[key] = ['["user","x"]', '["assistant","y"]']
+                fake_redis.versions[key] = fake_redis.versions.get(key, 0) + 1
+            real_multi()
+
+        pipe.multi = multi
+        return pipe
+
+    fake_redis.pipeline = racing_pipeline
+
+    async def run():
+        with pytest.raises(ChatSessionFullError):
+            await store.append("s", [{"role": "user", "content": "a"}] * 2)
+
+    asyncio.run(run())
+
+    assert len(fake_redis.lists[key]) == 2
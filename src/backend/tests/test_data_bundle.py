@@ -0,0 +1,70 @@
+import importlib.util
+import json
+import os
+import shutil
+
+import pytest
+
+from app.services.tarot_data_service import DEFAULT_DATA_DIR, load_bundle
+
+_spec = importlib.util.spec_from_file_location(
+    "build_data", os.path.join(DEFAULT_DATA_DIR, "build_data.py")
+)
+build_data = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build_data)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in build_data.SOURCE_FILES + (build_data.BUNDLE_FILE,):
+        shutil.copy(os.path.join(DEFAULT_DATA_DIR, name), tmp_path / name)
+    return tmp_path
+
+
+def test_committed_bundle_is_up_to_date():
+    assert build_data.main(["--check"]) == 0
+    bundle = load_bundle()
+    assert len(bundle["cards"]) == 78
+    assert bundle["cards"][bundle["cardIndex"]["ace_wands"]]["englishName"] == "Ace of Wands"
+    assert bundle["spreads"][bundle["spreadIndex"]["celtic_cross"]]["cardCount"] == 10
+
+
+def test_build_fails_on_missing_meaning(data_dir):
+    meanings_path = data_dir / build_data.MEANINGS_FILE
+    meanings = json.loads(meanings_path.read_text(encoding="utf-8"))
+    del meanings["The Fool"]
+    meanings_path.write_text(json.dumps(meanings, ensure_ascii=False), encoding="utf-8")
+
+    with pytest.raises(build_data.DataBuildError) as exc_info:
+        build_data.build_bundle(str(data_dir))
+    assert any("The Fool" in e for e in exc_info.value.errors)
+    assert build_data.main(["--data-dir", str(data_dir)]) == 1
+
+
+def test_build_fails_without_spreads_or_with_duplicate_english_names(data_dir):
+    (data_dir / build_data.SPREADS_FILE).write_text("{}", encoding="utf-8")
+    cards_path = data_dir / build_data.CARDS_FILE
+    cards = json.loads(cards_path.read_text(encoding="utf-8"))
+    cards["majorArcana"][1]["englishName"] = cards["majorArcana"][0]["englishName"]
+    cards_path.write_text(json.dumps(cards, ensure_ascii=False), encoding="utf-8")
+
+    with pytest.raises(build_data.DataBuildError) as exc_info:
+        build_data.build_bundle(str(data_dir))
+    errors = exc_info.value.errors
+    assert any("no spreads found" in e for e in errors)
+    assert any("duplicate englishName 'The Fool'" in e for e in errors)
+
+
+def test_rebuild_is_skipped_until_inputs_change(data_dir, capsys):
+    bundle_path = data_dir / build_data.BUNDLE_FILE
+    before = bundle_path.stat().st_mtime_ns
+
+    assert build_data.main(["--data-dir", str(data_dir)]) == 0
+    assert "skipping" in capsys.readouterr().out
+    assert bundle_path.stat().st_mtime_ns == before
+
+    spreads_path = data_dir / build_data.SPREADS_FILE
+    spreads_path.write_text(spreads_path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert build_data.main(["--data-dir", str(data_dir), "--check"]) == 1
+    assert build_data.main(["--data-dir", str(data_dir)]) == 0
+    assert build_data.main(["--data-dir", str(data_dir), "--check"]) == 0
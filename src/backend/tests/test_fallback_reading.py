@@ -0,0 +1,178 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.api.endpoints.tarot import analyze_tarot
+from app.core.config import settings
+from app.core.error_response import build_error_payload
+from app.schemas.tarot import TarotRequest
+from app.services.fallback_reading_service import build_fallback_reading
+from app.services.llm_stream_service import format_sse
+from app.services.load_shedder import LoadShedder, llm_load_shedder
+
+THREE_CARD_READING = {
+    "spreadName": "三张牌（时间流）",
+    "spreadId": "three_card_time",
+    "drawnCards": [
+        {
+            "card": {"id": "0", "name": "愚人", "englishName": "The Fool"},
+            "isReversed": False,
+            "position": {"id": 1, "name": "过去"},
+        },
+        {
+            "card": {"id": "ace_wands", "name": "权杖王牌", "englishName": "Ace of Wands"},
+            "isReversed": True,
+            "position": {"id": 2, "name": "现在"},
+        },
+    ],
+}
+
+
+def _sse_content(text: str) -> str:
+    content = ""
+    for frame in text.split("\n\n"):
+        data = frame[len("data: ") :] if frame.startswith("data: ") else ""
+        if data and data != "[DONE]":
+            content += json.loads(data)["choices"][0]["delta"]["content"]
+    return content
+
+
+def test_fallback_reading_uses_meanings_and_spread_positions(analyze_payload):
+    reading = build_fallback_reading(TarotRequest(**analyze_payload(**THREE_CARD_READING)))
+
+    assert "过去 · 愚人（正位）" in reading
+    assert "现在 · 权杖王牌（逆位）" in reading
+    # upright meaning of The Fool, reversed meaning of Ace of Wands
+    assert "愚者代表着一段无限可能的旅程的开始" in reading
+    assert "暗示着即使有想法也未能付诸行动" in reading
+    # position description comes from spreads.json
+    assert "问题的背景或起因" in reading
+    assert reading == build_fallback_reading(TarotRequest(**analyze_payload(**THREE_CARD_READING)))
+
+
+def test_load_shedder_thresholds_and_recovery():
+    shedder = LoadShedder(max_inflight=2, latency_threshold_ms=1000, window_seconds=10)
+    assert shedder.shed_reason(now=0) is None
+
+    shedder.begin()
+    shedder.begin()
+    assert shedder.shed_reason(now=0).startswith("inflight")
+    shedder.end()
+    shedder.end()
+
+    shedder.record_latency(1500, now=0)
+    assert shedder.shed_reason(now=1).startswith("latency")
+    assert shedder.shed_reason(now=11) is None
+
+
+def test_analyze_offline_mode_streams_without_api_key(
+    llm_settings, monkeypatch, analyze_payload, api_client
+):
+    monkeypatch.setattr(settings, "DEFAULT_LLM_API_KEY", "")
+
+    res = api_client(
+        lambda c: c.post(
+            "/api/v1/tarot/analyze",
+            json=analyze_payload(**THREE_CARD_READING, readingMode="offline"),
+        )
+    )
+
+    assert res.status_code == 200
+    assert res.headers.get("x-reading-mode") == "offline"
+    assert res.text.endswith("data: [DONE]\n\n")
+    assert "愚人（正位）" in _sse_content(res.text)
+
+
+def test_analyze_falls_back_when_load_shedding(
+    llm_settings, monkeypatch, analyze_payload, api_client
+):
+
+    async def fail_stream_chat_completion(**kwargs):
+        raise AssertionError("LLM must not be called while shedding")
+        yield
+
+    monkeypatch.setattr(
+        "app.api.endpoints.tarot.stream_chat_completion",
+        fail_stream_chat_completion,
+    )
+    monkeypatch.setattr(llm_load_shedder, "max_inflight", 1)
+    monkeypatch.setattr(llm_load_shedder, "inflight", 1)
+
+    res = api_client(
+        lambda c: c.post("/api/v1/tarot/analyze", json=analyze_payload(**THREE_CARD_READING))
+    )
+
+    assert res.status_code == 200
+    assert res.headers.get("x-reading-mode") == "offline"
+    assert "权杖王牌（逆位）" in _sse_content(res.text)
+
+
+def test_upstream_error_frames_count_toward_shedding(
+    llm_settings, monkeypatch, analyze_payload, api_client
+):
+    shedder = LoadShedder(
+        max_inflight=0,
+        latency_threshold_ms=1000,
+        window_seconds=60,
+        error_rate_threshold=0.5,
+        min_error_samples=3,
+    )
+    monkeypatch.setattr("app.api.endpoints.tarot.llm_load_shedder", shedder)
+    upstream_calls = []
+
+    async def overloaded_stream_chat_completion(**kwargs):
+        upstream_calls.append(kwargs)
+        yield format_sse(
+            build_error_payload("LLM service request failed", code="LLM_UPSTREAM_ERROR", status=429)
+        )
+
+    monkeypatch.setattr(
+        "app.api.endpoints.tarot.stream_chat_completion",
+        overloaded_stream_chat_completion,
+    )
+
+    async def post_four(client):
+        return [
+            await client.post("/api/v1/tarot/analyze", json=analyze_payload(**THREE_CARD_READING))
+            for _ in range(4)
+        ]
+
+    responses = api_client(post_four)
+
+    # Fast error frames are not latency samples, so they cannot hide the overload.
+    assert shedder.recent_latency_ms() == 0.0
+    assert len(upstream_calls) == 3
+    assert [r.headers.get("x-reading-mode") for r in responses] == ["llm"] * 3 + ["offline"]
+    assert shedder.shed_reason().startswith("error_rate")
+
+
+def test_inflight_slot_is_claimed_before_the_stream_starts(
+    llm_settings, monkeypatch, analyze_payload
+):
+    shedder = LoadShedder(max_inflight=1, latency_threshold_ms=0, window_seconds=60)
+    monkeypatch.setattr("app.api.endpoints.tarot.llm_load_shedder", shedder)
+
+    async def fake_stream_chat_completion(**kwargs):
+        yield 'data: {"choices":[{"delta":{"content":"解读"}}]}\n\n'
+
+    monkeypatch.setattr(
+        "app.api.endpoints.tarot.stream_chat_completion",
+        fake_stream_chat_completion,
+    )
+    request = SimpleNamespace(state=SimpleNamespace(request_id="burst"))
+    req = TarotRequest(**analyze_payload(**THREE_CARD_READING))
+
+    async def run():
+        first = await analyze_tarot(req, request)
+        # A second request arriving before the first body is iterated must see the slot taken.
+        second = await analyze_tarot(req, request)
+        assert second.headers["x-reading-mode"] == "offline"
+        assert shedder.inflight == 1
+
+        async for _ in first.body_iterator:
+            pass
+        await first.background()
+
+    asyncio.run(run())
+
+    assert shedder.inflight == 0
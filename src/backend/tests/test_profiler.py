@@ -0,0 +1,69 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+from app.core import profiler
+from app.core.config import settings
+from app.core.profiler import ProfilerBusyError, install_signal_handler, run_profile
+
+
+async def _block_the_loop():
+    await asyncio.sleep(0.05)
+    time.sleep(0.15)
+
+
+def test_profile_reports_blocking_coroutine(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_OUTPUT_DIR", str(tmp_path))
+
+    async def run():
+        blocker = asyncio.create_task(_block_the_loop())
+        report = await run_profile(0.4, interval_ms=2, block_threshold_ms=50)
+        await blocker
+        return report
+
+    report = asyncio.run(run())
+
+    assert report["samples"] > 0
+    assert report["loopLagMs"]["max"] >= 100
+    assert any("_block_the_loop" in e["stack"][-1] for e in report["blockingEvents"])
+
+    collapsed = open(report["files"]["cpu"], encoding="utf-8").read().splitlines()
+    stack, count = collapsed[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+    assert "_block_the_loop" in open(report["files"]["blocking"], encoding="utf-8").read()
+
+
+def test_profile_rejects_concurrent_sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_OUTPUT_DIR", str(tmp_path))
+
+    async def run():
+        first = asyncio.create_task(run_profile(0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(ProfilerBusyError):
+            await run_profile(0.2)
+        await first
+
+    asyncio.run(run())
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="SIGUSR2 is POSIX only")
+def test_signal_started_session_is_kept_until_done(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_OUTPUT_DIR", str(tmp_path))
+
+    async def run():
+        assert install_signal_handler(0.1)
+        try:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            await asyncio.sleep(0.02)
+            assert len(profiler._signal_tasks) == 1
+            await asyncio.gather(*profiler._signal_tasks)
+        finally:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR2)
+
+    asyncio.run(run())
+
+    assert profiler._signal_tasks == set()
+    assert any(name.endswith(".json") for name in os.listdir(tmp_path))
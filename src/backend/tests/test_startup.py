@@ -0,0 +1,19 @@
+from app.core.config import settings
+from app.core.startup_profile import import_time_report, measure_cold_import
+
+
+def test_cold_import_of_main_is_within_budget():
+    elapsed_ms, eager = measure_cold_import("main")
+
+    assert eager == [], f"lazy subsystems imported at startup: {eager}"
+    assert elapsed_ms <= settings.STARTUP_IMPORT_BUDGET_MS, (
+        f"cold import of main took {elapsed_ms:.0f}ms "
+        f"(budget {settings.STARTUP_IMPORT_BUDGET_MS}ms); run scripts/import_profile.py"
+    )
+
+
+def test_import_time_report_lists_app_modules():
+    names = {t.name for t in import_time_report("main")}
+
+    assert "main" in names
+    assert "app.api.endpoints.tarot" in names
@@ -0,0 +1,177 @@
+import asyncio
+import json
+
+import httpx
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import NOOP_SPAN, JsonlFileExporter, Tracer, render_timeline
+from app.services.llm_stream_service import stream_chat_completion
+
+
+def test_unsampled_requests_get_noop_spans():
+    tracer = Tracer(sample_rate=0.0, buffer_size=10)
+
+    assert tracer.start_trace("rid-1") is None
+    assert tracer.start_span("anything") is NOOP_SPAN
+
+
+def test_spans_nest_and_export(tmp_path):
+    export_path = tmp_path / "traces.jsonl"
+    exporter = JsonlFileExporter(str(export_path))
+    tracer = Tracer(sample_rate=0.0, buffer_size=10, exporter=exporter)
+
+    token = tracer.start_trace("rid-2", force=True)
+    with tracer.start_span("outer") as outer:
+        with tracer.start_span("inner"):
+            pass
+    tracer.detach(token)
+
+    spans = tracer.get_trace("rid-2")
+    assert [s.name for s in spans] == ["outer", "inner"]
+    assert spans[1].parent_id == outer.span_id
+
+    exporter.flush()
+    lines = export_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    exported = json.loads(lines[0])
+    assert len(exported["traceId"]) == 32
+    assert exported["parentSpanId"] == outer.span_id
+
+    timeline = render_timeline(spans)
+    assert "trace rid-2" in timeline
+    assert "\n  inner" in timeline
+
+
+def test_ring_buffer_drops_oldest_trace():
+    tracer = Tracer(sample_rate=1.0, buffer_size=2)
+    for rid in ("a", "b", "c"):
+        token = tracer.start_trace(rid)
+        tracer.start_span("s").end()
+        tracer.detach(token)
+
+    assert tracer.get_trace("a") == []
+    assert len(tracer.get_trace("c")) == 1
+
+
+def test_reused_trace_id_is_capped_and_kept_recent(monkeypatch):
+    monkeypatch.setattr(tracing, "MAX_SPANS_PER_TRACE", 5)
+    tracer = Tracer(sample_rate=1.0, buffer_size=2)
+    for rid in ("same", "other", "same"):
+        token = tracer.start_trace(rid)
+        for _ in range(4):
+            tracer.start_span("s").end()
+        tracer.detach(token)
+
+    token = tracer.start_trace("new")
+    tracer.start_span("s").end()
+    tracer.detach(token)
+
+    assert len(tracer.get_trace("same")) == 5
+    assert tracer.get_trace("other") == []
+
+
+def test_debug_endpoint_renders_request_timeline(
+    llm_settings, monkeypatch, analyze_payload, api_client
+):
+    monkeypatch.setattr(settings, "DEBUG_API_TOKEN", "debug-token")
+
+    async def fake_stream_chat_completion(**kwargs):
+        body_span = tracing.tracer.start_span("llm.stream")
+        yield 'data: {"content":"hello"}\n\n'
+        await asyncio.sleep(0.01)
+        body_span.end()
+
+    monkeypatch.setattr(
+        "app.api.endpoints.tarot.stream_chat_completion",
+        fake_stream_chat_completion,
+    )
+
+    async def run(client):
+        await client.post(
+            "/api/v1/tarot/analyze",
+            json=analyze_payload(),
+            headers={
+                "X-Request-ID": "trace-me",
+                "X-Trace-Sample": "1",
+                "X-Debug-Token": "debug-token",
+            },
+        )
+        denied = await client.get("/api/v1/debug/traces/trace-me")
+        timeline = await client.get(
+            "/api/v1/debug/traces/trace-me", headers={"X-Debug-Token": "debug-token"}
+        )
+        return denied, timeline
+
+    denied, timeline = api_client(run)
+
+    assert denied.status_code == 403
+    assert timeline.status_code == 200
+    for name in ("http.request", "request.validate", "llm.config", "prompt.build"):
+        assert name in timeline.text
+
+    spans = {s.name: s for s in tracing.tracer.get_trace("trace-me")}
+    # The root span covers the streamed body, not just the response headers.
+    assert spans["llm.stream"].parent_id == spans["http.request"].span_id
+    assert spans["http.request"].end_ns >= spans["llm.stream"].end_ns
+
+
+def test_forced_sampling_requires_debug_token(monkeypatch, api_client):
+    monkeypatch.setattr(settings, "DEBUG_API_TOKEN", "debug-token")
+    monkeypatch.setattr(tracing.tracer, "sample_rate", 0.0)
+
+    async def run(client):
+        for rid, token in (("anon", ""), ("wrong", "guess")):
+            await client.get(
+                "/api/v1/tarot/cards/suggest",
+                params={"q": "fool"},
+                headers={"X-Request-ID": rid, "X-Trace-Sample": "1", "X-Debug-Token": token},
+            )
+
+    api_client(run)
+
+    assert tracing.tracer.get_trace("anon") == []
+    assert tracing.tracer.get_trace("wrong") == []
+
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+def _trace_failed_stream(monkeypatch, trace_id, handler):
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda **kwargs: _RealAsyncClient(transport=httpx.MockTransport(handler), **kwargs),
+    )
+    tracer = Tracer(sample_rate=0.0, buffer_size=10)
+    monkeypatch.setattr("app.services.llm_stream_service.tracer", tracer)
+
+    async def run():
+        token = tracer.start_trace(trace_id, force=True)
+        try:
+            return [
+                chunk
+                async for chunk in stream_chat_completion(
+                    api_key="k", base_url="http://llm.test/v1", model="m", messages=[]
+                )
+            ]
+        finally:
+            tracer.detach(token)
+
+    chunks = asyncio.run(run())
+    assert '"error"' in chunks[0]
+    return {s.name: s for s in tracer.get_trace(trace_id)}
+
+
+def test_llm_spans_are_closed_when_upstream_fails(monkeypatch):
+    spans = _trace_failed_stream(monkeypatch, "rate-limited", lambda req: httpx.Response(429))
+    assert spans["llm.connect"].attributes == {"status": 429}
+    assert spans["llm.ttft"].attributes["error"] == "http_429"
+    assert spans["llm.stream"].attributes["error"] == "http_429"
+
+    def refuse(request):
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    spans = _trace_failed_stream(monkeypatch, "timeout", refuse)
+    assert spans["llm.connect"].attributes["error"] == "ConnectTimeout"
+    assert spans["llm.ttft"].attributes["error"] == "ConnectTimeout"
@@ -2,11 +2,11 @@
 
 import { useEffect, useState, useCallback } from 'react';
 import { useRouter } from 'next/navigation';
-import spreadsData from '../../data/spreads.json';
 import DrawnCardsDisplay from '../../components/DrawnCardsDisplay';
 import AnalysisDisplay from '../../components/AnalysisDisplay';
 import { useTarotAnalysis } from '@/hooks/useTarotAnalysis';
 import type { DrawnCard, Spread } from '@/types/tarot';
+import { getSpread } from '@/utils/tarotData';
 
 import ExportReportModal from '../../components/ExportReportModal';
 
@@ -84,7 +84,7 @@ export default function AnalysisPage() {
         const savedDrawnCards = sessionStorage.getItem('tarot_drawn_cards');
         if (!savedQuestion || !savedSpreadId || !savedDrawnCards) return null;
 
-        const selectedSpread = spreadsData.spreads.find((s) => s.id === savedSpreadId);
+        const selectedSpread = getSpread(savedSpreadId);
         if (!selectedSpread) return null;
 
         try {
@@ -105,6 +105,7 @@ export default function AnalysisPage() {
         isLoading,
         error,
         chatHistory,
+        chatSessionId,
         hasCustomApiConfig,
         customApiBaseUrl,
         customApiKey,
@@ -208,6 +209,7 @@ export default function AnalysisPage() {
                             isLoading={isLoading}
                             error={error}
                             chatHistory={chatHistory}
+                            chatSessionId={chatSessionId}
                             hasCustomApiConfig={hasCustomApiConfig}
                             customApiBaseUrl={customApiBaseUrl}
                             customApiKey={customApiKey}
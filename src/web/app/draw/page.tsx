@@ -10,8 +10,7 @@ import ExportReportModal from '@/components/ExportReportModal';
 import SpreadSelect from '@/components/SpreadSelect';
 import AtmosphereBackground from '@/components/AtmosphereBackground';
 import { useToast } from '@/components/Toast';
-import spreadsData from '../../data/spreads.json';
-import tarotCardsData from '../../data/tarot-cards.json';
+import { tarotCards, spreads, getSpread } from '@/utils/tarotData';
 import type { TarotCard, Spread, DrawnCard, ChatMessage, ApiConfig } from '@/types/tarot';
 import { analyzeTarotReading } from '@/hooks/useTarotAnalysis';
 import { constructTarotPrompts } from '@/utils/prompts';
@@ -61,14 +60,7 @@ export default function DrawPage() {
             model: localModel,
         });
 
-        const allCards = [
-            ...tarotCardsData.majorArcana,
-            ...tarotCardsData.minorArcana.wands,
-            ...tarotCardsData.minorArcana.cups,
-            ...tarotCardsData.minorArcana.swords,
-            ...tarotCardsData.minorArcana.pentacles,
-        ];
-        const shuffled = [...allCards].sort(() => Math.random() - 0.5);
+        const shuffled = [...tarotCards].sort(() => Math.random() - 0.5);
         setDeck(shuffled);
     }, []);
 
@@ -80,7 +72,7 @@ export default function DrawPage() {
 
     const handleStartDraw = (q: string, sId: string) => {
         setQuestion(q);
-        const foundSpread = spreadsData.spreads.find((s) => s.id === sId);
+        const foundSpread = getSpread(sId);
         if (foundSpread) {
             setSpread(foundSpread);
             setSetupMode(false);
@@ -180,14 +172,7 @@ export default function DrawPage() {
         setSetupMode(true);
 
         // Reshuffle
-        const allCards = [
-            ...tarotCardsData.majorArcana,
-            ...tarotCardsData.minorArcana.wands,
-            ...tarotCardsData.minorArcana.cups,
-            ...tarotCardsData.minorArcana.swords,
-            ...tarotCardsData.minorArcana.pentacles,
-        ];
-        const shuffled = [...allCards].sort(() => Math.random() - 0.5);
+        const shuffled = [...tarotCards].sort(() => Math.random() - 0.5);
         setDeck(shuffled);
     };
 
@@ -276,7 +261,7 @@ export default function DrawPage() {
                                 选择牌阵 / Spread
                             </label>
                             <SpreadSelect
-                                spreads={spreadsData.spreads}
+                                spreads={spreads}
                                 value={spread}
                                 onChange={(s) => setSpread(s)}
                                 placeholder="请选择适宜的牌阵"
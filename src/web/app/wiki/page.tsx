@@ -1,10 +1,10 @@
 'use client';
 
-import { useState, useMemo, useCallback } from 'react';
-import tarotCardsData from '../../data/tarot-cards.json';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import AtmosphereBackground from '@/components/AtmosphereBackground';
 import CardDetailModal from '@/components/CardDetailModal';
 import WikiCard from '@/components/WikiCard';
+import { apiRequest, assertOk } from '@/utils/apiClient';
 
 // Define explicit type for card data
 interface TarotCardData {
@@ -18,40 +18,77 @@ interface TarotCardData {
     reversedMeaning?: string;
 }
 
+interface CardSearchResponse {
+    total: number;
+    page: number;
+    results: TarotCardData[];
+}
+
 const CARDS_PER_PAGE = 20;
+const SEARCH_DEBOUNCE_MS = 200;
+
+async function fetchCardPage(query: string, page: number): Promise<CardSearchResponse> {
+    const params = new URLSearchParams({
+        q: query,
+        page: String(page),
+        size: String(CARDS_PER_PAGE),
+    });
+    const response = await apiRequest(`/api/v1/tarot/cards/search?${params}`, {
+        timeoutMs: 15000,
+        includeAuth: false,
+    });
+    await assertOk(response, '图鉴加载失败');
+    return response.json();
+}
 
 export default function WikiPage() {
     const [search, setSearch] = useState('');
     const [selectedCard, setSelectedCard] = useState<TarotCardData | null>(null);
-    const [displayCount, setDisplayCount] = useState(CARDS_PER_PAGE);
-
-    const allTarotCards = useMemo(() => {
-        const majors = tarotCardsData.majorArcana || [];
-        const minors = tarotCardsData.minorArcana || {};
-        return [
-            ...majors,
-            ...(minors.wands || []),
-            ...(minors.cups || []),
-            ...(minors.swords || []),
-            ...(minors.pentacles || []),
-        ] as TarotCardData[];
-    }, []);
-
-    const filteredCards = useMemo(() => {
-        if (!search) return allTarotCards;
-        const lowerSearch = search.toLowerCase();
-        return allTarotCards.filter(
-            (c) => c.name.includes(search) || c.englishName.toLowerCase().includes(lowerSearch)
-        );
-    }, [search, allTarotCards]);
-
-    const displayedCards = useMemo(() => {
-        return filteredCards.slice(0, displayCount);
-    }, [filteredCards, displayCount]);
-
-    const handleLoadMore = useCallback(() => {
-        setDisplayCount((prev) => Math.min(prev + CARDS_PER_PAGE, filteredCards.length));
-    }, [filteredCards.length]);
+    const [cards, setCards] = useState<TarotCardData[]>([]);
+    const [total, setTotal] = useState(0);
+    const [page, setPage] = useState(1);
+    const [isLoading, setIsLoading] = useState(false);
+    const [error, setError] = useState('');
+    // Drops responses for queries the user has already typed past.
+    const latestQueryRef = useRef('');
+
+    useEffect(() => {
+        const query = search.trim();
+        latestQueryRef.current = query;
+        const timer = window.setTimeout(async () => {
+            setIsLoading(true);
+            setError('');
+            try {
+                const data = await fetchCardPage(query, 1);
+                if (latestQueryRef.current !== query) return;
+                setCards(data.results);
+                setTotal(data.total);
+                setPage(1);
+            } catch (err) {
+                if (latestQueryRef.current !== query) return;
+                setError(err instanceof Error ? err.message : '图鉴加载失败');
+            } finally {
+                if (latestQueryRef.current === query) setIsLoading(false);
+            }
+        }, SEARCH_DEBOUNCE_MS);
+        return () => window.clearTimeout(timer);
+    }, [search]);
+
+    const handleLoadMore = useCallback(async () => {
+        const query = latestQueryRef.current;
+        setIsLoading(true);
+        try {
+            const data = await fetchCardPage(query, page + 1);
+            if (latestQueryRef.current !== query) return;
+            setCards((prev) => [...prev, ...data.results]);
+            setTotal(data.total);
+            setPage(data.page);
+        } catch (err) {
+            setError(err instanceof Error ? err.message : '图鉴加载失败');
+        } finally {
+            setIsLoading(false);
+        }
+    }, [page]);
 
     const handleCardClick = useCallback((card: TarotCardData) => {
         setSelectedCard(card);
@@ -61,7 +98,7 @@ export default function WikiPage() {
         setSelectedCard(null);
     }, []);
 
-    const hasMore = displayCount < filteredCards.length;
+    const hasMore = cards.length < total;
 
     return (
         <div className="min-h-screen bg-bg-main pt-24 pb-12 px-4 font-serif text-text-main relative overflow-hidden">
@@ -105,21 +142,22 @@ export default function WikiPage() {
                             type="text"
                             placeholder="搜索牌名 (如: 愚人, Fool)..."
                             value={search}
-                            onChange={(e) => {
-                                setSearch(e.target.value);
-                                setDisplayCount(CARDS_PER_PAGE); // Reset display count on search
-                            }}
+                            onChange={(e) => setSearch(e.target.value)}
                             className="ink-input w-full text-center bg-card-bg border-border text-text-main placeholder:text-text-muted focus:border-accent-main"
                         />
                     </div>
 
                     {/* Card Count Info */}
                     <div className="text-center mb-6 text-sm text-text-muted">
-                        显示 {displayedCards.length} / {filteredCards.length} 张牌
+                        显示 {cards.length} / {total} 张牌
                     </div>
 
+                    {error && (
+                        <div className="text-center mb-6 text-sm text-accent-main">{error}</div>
+                    )}
+
                     <div className="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-5 gap-4 md:gap-6">
-                        {displayedCards.map((card) => (
+                        {cards.map((card) => (
                             <WikiCard
                                 key={card.id}
                                 card={card}
@@ -133,6 +171,7 @@ export default function WikiPage() {
                         <div className="mt-12 flex justify-center">
                             <button
                                 onClick={handleLoadMore}
+                                disabled={isLoading}
                                 className="btn-seal flex items-center gap-2 px-8 py-3"
                             >
                                 <svg
@@ -148,7 +187,7 @@ export default function WikiPage() {
                                 >
                                     <polyline points="6 9 12 15 18 9" />
                                 </svg>
-                                <span>加载更多 ({filteredCards.length - displayCount} 张)</span>
+                                <span>加载更多 ({total - cards.length} 张)</span>
                             </button>
                         </div>
                     )}
@@ -14,6 +14,7 @@ interface AnalysisDisplayProps {
     isLoading: boolean;
     error: string;
     chatHistory: ChatMessage[];
+    chatSessionId: string | null;
     hasCustomApiConfig: boolean;
     customApiBaseUrl: string | null;
     customApiKey: string | null;
@@ -50,6 +51,7 @@ export default function AnalysisDisplay({
     isLoading,
     error,
     chatHistory,
+    chatSessionId,
     hasCustomApiConfig,
     customApiBaseUrl,
     customApiKey,
@@ -200,7 +202,13 @@ export default function AnalysisDisplay({
                 )}
 
                 {/* Chat Section */}
-                {analysis && <TarotChat initialHistory={chatHistory} apiConfig={apiConfig} />}
+                {analysis && (
+                    <TarotChat
+                        initialHistory={chatHistory}
+                        sessionId={chatSessionId}
+                        apiConfig={apiConfig}
+                    />
+                )}
 
                 {/* Reinterpret Section */}
                 {analysis && (
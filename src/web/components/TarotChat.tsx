@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 import { apiRequest, assertOk } from '@/utils/apiClient';
@@ -11,11 +11,16 @@ import type { ChatMessage, ApiConfig } from '@/types/tarot';
 
 interface TarotChatProps {
     initialHistory: ChatMessage[];
+    /** Server-held conversation from /analyze; when set only the new turn is uploaded. */
+    sessionId?: string | null;
     apiConfig: ApiConfig;
     endpoint?: string;
     title?: string;
 }
 
+// Session not found/expired, session full, session store unavailable
+const SESSION_FALLBACK_STATUSES = [404, 409, 503];
+
 const ChatIcon = () => (
     <svg
         xmlns="http://www.w3.org/2000/svg"
@@ -35,6 +40,7 @@ const ChatIcon = () => (
 
 export default function TarotChat({
     initialHistory,
+    sessionId = null,
     apiConfig: _apiConfig,
     endpoint = '/api/v1/tarot/chat',
     title = '塔罗师对话',
@@ -43,6 +49,13 @@ export default function TarotChat({
     const [history, setHistory] = useState<ChatMessage[]>(initialHistory);
     const [input, setInput] = useState('');
     const [isLoading, setIsLoading] = useState(false);
+    // Cleared once a session request fails: turns sent as full history are not recorded
+    // server-side, so the stored session no longer matches this conversation.
+    const sessionUsable = useRef(true);
+
+    useEffect(() => {
+        sessionUsable.current = true;
+    }, [sessionId]);
 
     useEffect(() => {
         if (initialHistory.length > 0) {
@@ -61,10 +74,23 @@ export default function TarotChat({
         setIsLoading(true);
 
         try {
-            const response = await apiRequest(endpoint, {
-                method: 'POST',
-                body: JSON.stringify({ messages: newHistory }),
-            });
+            let response =
+                sessionId && sessionUsable.current
+                    ? await apiRequest(endpoint, {
+                          method: 'POST',
+                          body: JSON.stringify({ sessionId, message: userMsg.content }),
+                      })
+                    : null;
+            // No session, or the session itself is unusable (expired, full, store
+            // unavailable): fall back to uploading the full history. Other errors such as
+            // 422/429 would fail the same way with the full history, so they surface as-is.
+            if (!response || SESSION_FALLBACK_STATUSES.includes(response.status)) {
+                sessionUsable.current = false;
+                response = await apiRequest(endpoint, {
+                    method: 'POST',
+                    body: JSON.stringify({ messages: newHistory }),
+                });
+            }
             await assertOk(response, 'API 错误');
 
             const reader = response.body?.getReader();
@@ -0,0 +1,247 @@
+"""
+塔罗数据构建：合并牌面、牌意与牌阵，校验后输出紧凑的运行时数据包。
+
+    python data/build_data.py            # 输入未变化时跳过
+    python data/build_data.py --force    # 强制重建
+    python data/build_data.py --check    # 数据包过期或校验失败时以非零状态退出（CI 用）
+    python data/build_data.py --gzip     # 额外输出 tarot-bundle.json.gz
+
+源文件（tarot-cards.json / tarot_meanings_zh.json / spreads.json）保持可读格式供人工编辑；
+后端与 Next.js 只读取生成的 tarot-bundle.json。
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Optional
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+CARDS_FILE = "tarot-cards.json"
+MEANINGS_FILE = "tarot_meanings_zh.json"
+SPREADS_FILE = "spreads.json"
+BUNDLE_FILE = "tarot-bundle.json"
+SOURCE_FILES = (CARDS_FILE, MEANINGS_FILE, SPREADS_FILE)
+
+# Bump when the bundle layout changes; it is part of the source hash.
+BUNDLE_VERSION = 1
+
+MINOR_SUITS = ("wands", "cups", "swords", "pentacles")
+CARD_FIELDS = {
+    "id": (int, str),
+    "name": str,
+    "englishName": str,
+    "suit": str,
+    "uprightKeywords": list,
+    "reversedKeywords": list,
+}
+OPTIONAL_CARD_FIELDS = {"number": (int, str), "court": str}
+SPREAD_FIELDS = {
+    "id": str,
+    "name": str,
+    "englishName": str,
+    "description": str,
+    "cardCount": int,
+    "positions": list,
+}
+POSITION_FIELDS = {"id": int, "name": str, "description": str}
+
+
+class DataBuildError(Exception):
+    def __init__(self, errors: list[str]):
+        super().__init__(f"{len(errors)} data error(s):\n" + "\n".join(f"  - {e}" for e in errors))
+        self.errors = errors
+
+
+def _check_fields(
+    obj: Any,
+    where: str,
+    required: dict[str, Any],
+    optional: Optional[dict[str, Any]] = None,
+) -> list[str]:
+    if not isinstance(obj, dict):
+        return [f"{where}: expected an object"]
+    optional = optional or {}
+    errors = []
+    for key, expected in required.items():
+        if key not in obj:
+            errors.append(f"{where}: missing '{key}'")
+        elif not isinstance(obj[key], expected) or isinstance(obj[key], bool):
+            errors.append(f"{where}: '{key}' has type {type(obj[key]).__name__}")
+        elif obj[key] in ("", []):
+            errors.append(f"{where}: '{key}' is empty")
+    for key, expected in optional.items():
+        if key in obj and not isinstance(obj[key], expected):
+            errors.append(f"{where}: '{key}' has type {type(obj[key]).__name__}")
+    for key in obj.keys() - required.keys() - optional.keys():
+        errors.append(f"{where}: unexpected field '{key}'")
+    return errors
+
+
+def source_hash(data_dir: str = DATA_DIR) -> str:
+    digest = hashlib.sha256(f"bundle-v{BUNDLE_VERSION}".encode("utf-8"))
+    for name in SOURCE_FILES:
+        with open(os.path.join(data_dir, name), "rb") as f:
+            digest.update(name.encode("utf-8") + b"\0" + f.read() + b"\0")
+    return digest.hexdigest()
+
+
+def _load(data_dir: str, name: str) -> Any:
+    with open(os.path.join(data_dir, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_bundle(data_dir: str = DATA_DIR) -> dict[str, Any]:
+    """Join and validate the sources; raises DataBuildError listing every problem found."""
+    cards_data = _load(data_dir, CARDS_FILE)
+    meanings = _load(data_dir, MEANINGS_FILE)
+    spreads = _load(data_dir, SPREADS_FILE).get("spreads") or []
+    errors: list[str] = []
+
+    deck = [("major", card) for card in cards_data.get("majorArcana", [])]
+    for suit in MINOR_SUITS:
+        deck += [(suit, card) for card in cards_data.get("minorArcana", {}).get(suit, [])]
+    if not deck:
+        errors.append(f"{CARDS_FILE}: no cards found")
+    if not spreads:
+        errors.append(f"{SPREADS_FILE}: no spreads found")
+
+    cards: list[dict[str, Any]] = []
+    card_index: dict[str, int] = {}
+    english_names: set[str] = set()
+    for expected_suit, card in deck:
+        where = f"{CARDS_FILE} card {card.get('id', '?') if isinstance(card, dict) else '?'}"
+        card_errors = _check_fields(card, where, CARD_FIELDS, OPTIONAL_CARD_FIELDS)
+        errors += card_errors
+        if card_errors:
+            continue
+        if card["suit"] != expected_suit:
+            errors.append(f"{where}: suit '{card['suit']}' listed under '{expected_suit}'")
+        key = str(card["id"])
+        if key in card_index:
+            errors.append(f"{where}: duplicate id")
+            continue
+        # Meanings are joined on englishName, so it must be unique too.
+        if card["englishName"] in english_names:
+            errors.append(f"{where}: duplicate englishName '{card['englishName']}'")
+            continue
+        english_names.add(card["englishName"])
+
+        # Meanings are matched by exact englishName; no case guessing.
+        meaning = meanings.get(card["englishName"])
+        if meaning is None:
+            errors.append(f"{where}: no meaning for '{card['englishName']}' in {MEANINGS_FILE}")
+            continue
+        meaning_errors = _check_fields(
+            meaning, f"{MEANINGS_FILE} '{card['englishName']}'", {"upright": str, "reversed": str}
+        )
+        errors += meaning_errors
+        if meaning_errors:
+            continue
+
+        card_index[key] = len(cards)
+        cards.append(
+            {
+                **card,
+                "uprightMeaning": meaning["upright"],
+                "reversedMeaning": meaning["reversed"],
+            }
+        )
+
+    known_names = {card["englishName"] for _, card in deck if isinstance(card, dict)}
+    for name in meanings.keys() - known_names:
+        errors.append(f"{MEANINGS_FILE}: meaning '{name}' does not match any card")
+
+    spread_index: dict[str, int] = {}
+    for spread in spreads:
+        where = (
+            f"{SPREADS_FILE} spread {spread.get('id', '?') if isinstance(spread, dict) else '?'}"
+        )
+        spread_errors = _check_fields(spread, where, SPREAD_FIELDS)
+        errors += spread_errors
+        if spread_errors:
+            continue
+        for i, position in enumerate(spread["positions"]):
+            errors += _check_fields(position, f"{where} position {i + 1}", POSITION_FIELDS)
+        if spread["cardCount"] != len(spread["positions"]):
+            errors.append(
+                f"{where}: cardCount {spread['cardCount']} but "
+                f"{len(spread['positions'])} positions"
+            )
+        if spread["id"] in spread_index:
+            errors.append(f"{where}: duplicate id")
+        spread_index[spread["id"]] = len(spread_index)
+
+    if errors:
+        raise DataBuildError(errors)
+
+    return {
+        "version": BUNDLE_VERSION,
+        "sourceHash": source_hash(data_dir),
+        "cards": cards,
+        "cardIndex": card_index,
+        "spreads": spreads,
+        "spreadIndex": spread_index,
+    }
+
+
+def read_bundle_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("sourceHash")
+    except (OSError, ValueError):
+        return None
+
+
+def write_bundle(bundle: dict[str, Any], path: str, write_gzip: bool = False) -> None:
+    payload = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(payload + b"\n")
+    if write_gzip:
+        # mtime=0 keeps the compressed output byte-identical across rebuilds.
+        with gzip.GzipFile(f"{path}.gz", "wb", compresslevel=9, mtime=0) as f:
+            f.write(payload)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the compact tarot data bundle.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    parser.add_argument("--check", action="store_true", help="fail if the bundle is stale")
+    parser.add_argument("--gzip", action="store_true", help="also write tarot-bundle.json.gz")
+    args = parser.parse_args(argv)
+
+    bundle_path = os.path.join(args.data_dir, BUNDLE_FILE)
+    current_hash = source_hash(args.data_dir)
+    up_to_date = read_bundle_hash(bundle_path) == current_hash
+    gzip_missing = args.gzip and not os.path.exists(f"{bundle_path}.gz")
+
+    if up_to_date and not (args.check or args.force or gzip_missing):
+        print(f"{BUNDLE_FILE} is up to date ({current_hash[:12]}), skipping")
+        return 0
+
+    try:
+        bundle = build_bundle(args.data_dir)
+    except DataBuildError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.check:
+        if not up_to_date:
+            print(f"{BUNDLE_FILE} is stale; run: python data/build_data.py", file=sys.stderr)
+            return 1
+        print(f"{BUNDLE_FILE} is up to date ({current_hash[:12]})")
+        return 0
+
+    write_bundle(bundle, bundle_path, write_gzip=args.gzip)
+    print(
+        f"Wrote {BUNDLE_FILE}: {len(bundle['cards'])} cards, "
+        f"{len(bundle['spreads'])} spreads ({current_hash[:12]})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
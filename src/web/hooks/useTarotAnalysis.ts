@@ -21,6 +21,7 @@ interface AnalysisState {
     isLoading: boolean;
     error: string;
     chatHistory: ChatMessage[];
+    chatSessionId: string | null;
 }
 
 export function useTarotAnalysis() {
@@ -29,6 +30,7 @@ export function useTarotAnalysis() {
         isLoading: false,
         error: '',
         chatHistory: [],
+        chatSessionId: null,
     });
 
     const [apiConfig, setApiConfig] = useState<ApiConfigState>({
@@ -73,6 +75,7 @@ export function useTarotAnalysis() {
                 isLoading: true,
                 error: '',
                 chatHistory: [],
+                chatSessionId: null,
             }));
 
             let success = false;
@@ -143,6 +146,8 @@ export function useTarotAnalysis() {
                     }),
                 });
                 await assertOk(response, 'API 请求失败');
+                // Server-held conversation: follow-up chat only sends this id + the new turn
+                const chatSessionId = response.headers.get('X-Chat-Session-ID');
 
                 const reader = response.body?.getReader();
                 if (!reader) {
@@ -182,6 +187,7 @@ export function useTarotAnalysis() {
                             { role: 'user', content: userPrompt },
                             { role: 'assistant', content: analysisText },
                         ],
+                        chatSessionId,
                     }));
 
                     try {
@@ -0,0 +1,13 @@
+// 运行时塔罗数据：由 data/build_data.py 从 tarot-cards.json / tarot_meanings_zh.json / spreads.json 生成
+import bundle from '@/data/tarot-bundle.json';
+import type { TarotCard, Spread } from '@/types/tarot';
+
+// 78 张牌，按大阿尔卡那、权杖、圣杯、宝剑、星币的顺序
+export const tarotCards: TarotCard[] = bundle.cards;
+
+export const spreads: Spread[] = bundle.spreads;
+
+export const getSpread = (spreadId: string): Spread | undefined => {
+    const index = (bundle.spreadIndex as Record<string, number>)[spreadId];
+    return index === undefined ? undefined : spreads[index];
+};